@@ -0,0 +1,184 @@
+"""Admin throughput under concurrent load with 1 and more ASGI workers.
+
+Collects the static files into a temporary STATIC_ROOT, starts
+`uvicorn eda.core.asgi:application --workers N` for every --workers value and
+requests a mix of admin pages, autocomplete lookups and a hashed static file
+from --concurrency clients at once, as a logged-in superuser. Checks that the
+static file comes precompressed with a far-future Cache-Control.
+
+    python benchmarks/admin_load.py --workers 1 4 --concurrency 16 --requests 400
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import django
+import httpx
+
+USERNAME = "loadtest"
+
+
+def _prepare(static_root: str) -> tuple[str, list[str], str]:
+    """Returns the session cookie, the URLs to request and a static file URL."""
+    from django.contrib.auth.models import User
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.core.management import call_command
+    from django.test import Client
+
+    from eda.core import settings
+    from eda.food import models
+
+    call_command("collectstatic", interactive=False, verbosity=0)
+    user, _ = User.objects.get_or_create(
+        username=USERNAME, defaults={"is_staff": True, "is_superuser": True}
+    )
+    client = Client()
+    client.force_login(user)
+
+    recipe_id = models.Recipe.objects.values_list("id", flat=True).first()
+    menu_id = models.Menu.objects.values_list("id", flat=True).first()
+    static_url = (
+        f"/{settings.STATIC_URL}{staticfiles_storage.stored_name('admin/css/base.css')}"
+    )
+    urls = [
+        "/admin/food/recipe/",
+        "/admin/food/menu/",
+        f"/admin/food/recipe/{recipe_id}/change/",
+        f"/admin/food/menu/{menu_id}/change/",
+        "/admin/autocomplete/?app_label=food&model_name=ingredient"
+        "&field_name=product&term=мол",
+        static_url,
+    ]
+    return client.cookies["sessionid"].value, urls, static_url
+
+
+def _start_server(workers: int, port: int, static_root: str) -> subprocess.Popen:
+    env = {**os.environ, "DEBUG": "off", "STATIC_ROOT": static_root}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "eda.core.asgi:application",
+            f"--workers={workers}",
+            f"--port={port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+
+
+async def _wait_until_up(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            await client.get("/admin/login/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("The server did not start")
+
+
+async def _check_static(client: httpx.AsyncClient, static_url: str) -> bool:
+    response = await client.get(static_url, headers={"Accept-Encoding": "br, gzip"})
+    cache_control = response.headers.get("Cache-Control", "")
+    print(
+        f"static: {response.status_code}"
+        f" Content-Encoding={response.headers.get('Content-Encoding')}"
+        f" Cache-Control={cache_control}"
+    )
+    return (
+        response.headers.get("Content-Encoding") == "br"
+        and "immutable" in cache_control
+    )
+
+
+async def _load(
+    client: httpx.AsyncClient, urls: list[str], concurrency: int, total: int
+) -> tuple[float, dict[str, list[float]], int]:
+    requests = itertools.islice(itertools.cycle(urls), total)
+    latencies: dict[str, list[float]] = {url: [] for url in urls}
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for url in requests:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies[url].append(time.perf_counter() - started)
+            if response.status_code != 200:
+                print(f"{url}: {response.status_code}")
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, errors
+
+
+async def _run(
+    workers: int, port: int, static_root: str, args, session_id: str, urls, static_url
+) -> bool:
+    server = _start_server(workers, port, static_root)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://localhost:{port}",
+            cookies={"sessionid": session_id},
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=60,
+        ) as client:
+            await _wait_until_up(client)
+            static_ok = await _check_static(client, static_url)
+            # Warm up every worker's connections and caches.
+            await _load(client, urls, args.concurrency, len(urls) * workers * 2)
+            elapsed, latencies, errors = await _load(
+                client, urls, args.concurrency, args.requests
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+    everything = [latency for url in urls for latency in latencies[url]]
+    print(
+        f"workers={workers:<2} {args.requests / elapsed:6.1f} req/s,"
+        f" p50 {statistics.median(everything) * 1000:6.1f} ms,"
+        f" p95 {statistics.quantiles(everything, n=20)[18] * 1000:6.1f} ms,"
+        f" errors {errors}"
+    )
+    # Cheap requests should not queue behind the heavy pages.
+    for url in urls:
+        print(f"  {statistics.median(latencies[url]) * 1000:8.1f} ms  {url[:70]}")
+    return static_ok and not errors
+
+
+def main(args) -> bool:
+    ok = True
+    with tempfile.TemporaryDirectory() as static_root:
+        os.environ["STATIC_ROOT"] = static_root
+        django.setup()
+        session_id, urls, static_url = _prepare(static_root)
+        for workers in args.workers:
+            ok &= asyncio.run(
+                _run(
+                    workers, args.port, static_root, args, session_id, urls, static_url
+                )
+            )
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if not main(args):
+        sys.exit(1)
@@ -0,0 +1,105 @@
+"""Throughput of 100 concurrent service calls, executor threads vs async ORM.
+
+"threads" runs the synchronous fetchers with
+`sync_to_async(thread_sensitive=False)`, as the services used to. "async" uses
+the async queryset API. The cache is bypassed, so every call hits the
+database. Fill the database first, e.g. `python eda/manage.py generate_data`.
+
+    python benchmarks/async_services.py --calls 100 --rounds 5
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import statistics
+import time
+
+import django
+
+
+async def _measure(calls: list) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for call in calls))
+    return time.perf_counter() - started
+
+
+def _cases(dates: list[dt.date]) -> dict[str, dict]:
+    from asgiref.sync import sync_to_async
+
+    from eda.food import services
+
+    def threaded(function):
+        return sync_to_async(function, thread_sensitive=False)
+
+    def grocery_dates(date):
+        return [date, date + dt.timedelta(days=1)]
+
+    return {
+        "menus": {
+            "threads": [
+                lambda date=date: threaded(services._fetch_menus)([date])
+                for date in dates
+            ],
+            "async": [
+                lambda date=date: services._afetch_menus([date]) for date in dates
+            ],
+        },
+        "grocery lists": {
+            "threads": [
+                lambda date=date: threaded(
+                    lambda: list(services.grocery_queryset(grocery_dates(date)))
+                )()
+                for date in dates
+            ],
+            "async": [
+                lambda date=date: services._fetch_grocery_lists(grocery_dates(date))
+                for date in dates
+            ],
+        },
+    }
+
+
+def run(calls: int, rounds: int) -> None:
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    from eda.food import models
+
+    opened = 0
+
+    def count(sender, **kwargs):
+        nonlocal opened
+        opened += 1
+
+    connection_created.connect(count)
+    dates = list(
+        models.Menu.objects.order_by("date").values_list("date", flat=True)[:calls]
+    )
+    connections.close_all()
+
+    for case, variants in _cases(dates).items():
+        for variant, variant_calls in variants.items():
+            # A fresh loop per variant, so each starts with an empty default
+            # executor, like a freshly started bot.
+            loop = asyncio.new_event_loop()
+            opened = 0
+            timings = [
+                loop.run_until_complete(_measure(variant_calls)) for _ in range(rounds)
+            ]
+            loop.close()
+            median = statistics.median(timings)
+            print(
+                f"{case:<14} {variant:<8} {median * 1000:9.1f} ms"
+                f" {len(variant_calls) / median:8.0f} calls/s"
+                f" {opened:4d} new connections"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    django.setup()
+    run(args.calls, args.rounds)
@@ -0,0 +1,52 @@
+"""Serial delivery vs Dispatcher fan-out of the daily menu to many chats.
+
+python benchmarks/broadcast.py --chats 200 --delay 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_telegram import FakeTelegram
+
+from eda.core import settings
+
+MESSAGES = [("Меню на сегодня", {}), ("*Завтрак*\nКаша", {"parse_mode": "MarkdownV2"})]
+
+
+async def _serial(bot, chat_ids: list[int]) -> None:
+    for chat_id in chat_ids:
+        for text, kwargs in MESSAGES:
+            await bot.send_message(chat_id, text, **kwargs)
+
+
+async def _dispatcher(bot, chat_ids: list[int]) -> None:
+    from eda.telegrambot import dispatch
+
+    await dispatch.Dispatcher(bot).broadcast(chat_ids, MESSAGES)
+
+
+async def main(chats: int, delay: float) -> None:
+    from eda.telegrambot import utils
+
+    chat_ids = list(range(1, chats + 1))
+    for name, run in (("serial", _serial), ("fan-out", _dispatcher)):
+        async with FakeTelegram(delay=delay) as fake:
+            settings.TELEGRAM_API_URL = fake.url
+            async with utils.get_telegram().bot as bot:
+                started = time.perf_counter()
+                await run(bot, chat_ids)
+                elapsed = time.perf_counter() - started
+            print(f"{name:>8}: {chats} chats in {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    asyncio.run(main(args.chats, args.delay))
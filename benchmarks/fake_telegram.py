@@ -0,0 +1,91 @@
+"""Minimal local stand-in for the Telegram Bot API.
+
+Speaks HTTP/1.1 with keep-alive and answers every method with a canned
+successful response. `handshake_delay` is added to the first response on each
+new connection to emulate the TCP+TLS setup cost of the real API.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+import urllib.parse
+
+
+class FakeTelegram:
+    def __init__(self, handshake_delay: float = 0.0, delay: float = 0.0) -> None:
+        self.handshake_delay = handshake_delay
+        self.delay = delay
+        self.connections = 0
+        self.requests: list[tuple[str, dict]] = []
+        self._message_ids = itertools.count(1)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/bot"
+
+    async def __aenter__(self) -> "FakeTelegram":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        delay = self.handshake_delay
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = dict(
+                    line.lower().split(": ", 1) for line in header_lines if line
+                )
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                method = request_line.split()[1].rsplit("/", 1)[-1]
+                payload = self._parse(headers.get("content-type", ""), body)
+                self.requests.append((method, payload))
+
+                if method == "getUpdates":
+                    # Emulate an empty long poll without spinning the client.
+                    delay += 0.1
+                await asyncio.sleep(delay + self.delay)
+                delay = 0.0
+                response = json.dumps(
+                    {"ok": True, "result": self._result(method, payload)}
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(response), response)
+                )
+                await writer.drain()
+        except (asyncio.CancelledError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse(content_type: str, body: bytes) -> dict:
+        if content_type.startswith("application/json") and body:
+            return json.loads(body)
+        if content_type.startswith("application/x-www-form-urlencoded") and body:
+            return dict(urllib.parse.parse_qsl(body.decode()))
+        return {}
+
+    def _result(self, method: str, payload: dict) -> dict | bool:
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "eda", "username": "eda_bot"}
+        if method == "getUpdates":
+            return []
+        if method == "sendMessage":
+            return {
+                "message_id": next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": int(payload.get("chat_id", 0)), "type": "private"},
+                "text": payload.get("text", ""),
+            }
+        return True
@@ -0,0 +1,93 @@
+"""Import-time report for the worker entry points.
+
+Runs `python -X importtime -c "import eda.<entry point>"` in a fresh
+interpreter, which includes `django.setup()`, and prints the total import time
+with the slowest top-level packages. Exits with status 1 if an entry point
+imports a module it should not, e.g. the admin or telegram.ext in beat, or
+takes longer than --budget-ms.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py eda.beat --top 20 --budget-ms 800
+"""
+
+import argparse
+import collections
+import subprocess
+import sys
+
+ENTRY_POINTS = ["eda.bot", "eda.beat", "eda.worker"]
+# Module prefixes that mean a startup regression.
+WORKER_FORBIDDEN = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.messages",
+    "django.contrib.sessions",
+    "django.contrib.staticfiles",
+]
+FORBIDDEN = {
+    "eda.bot": WORKER_FORBIDDEN,
+    "eda.beat": [*WORKER_FORBIDDEN, "telegram.ext"],
+    "eda.worker": WORKER_FORBIDDEN,
+}
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Self import time in microseconds of every module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    # Django is one package, show which part of it is slow.
+    return ".".join(parts[:3] if parts[0] == "django" else parts[:1])
+
+
+def report(module: str, top: int, budget_ms: float | None) -> bool:
+    times = _import_times(module)
+    total_ms = sum(times.values()) / 1000
+    print(f"{module}: {total_ms:.0f} ms, {len(times)} modules")
+
+    packages: collections.Counter[str] = collections.Counter()
+    for name, self_us in times.items():
+        packages[_package(name)] += self_us
+    for package, self_us in packages.most_common(top):
+        print(f"  {package:<40} {self_us / 1000:7.1f} ms")
+
+    ok = True
+    forbidden = sorted(
+        name
+        for name in times
+        for prefix in FORBIDDEN.get(module, [])
+        if name == prefix or name.startswith(f"{prefix}.")
+    )
+    if forbidden:
+        print(f"  imports {', '.join(forbidden[:5])}{', ...' * (len(forbidden) > 5)}")
+        ok = False
+    if budget_ms is not None and total_ms > budget_ms:
+        print(f"  over the budget of {budget_ms:.0f} ms")
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args()
+
+    results = [report(module, args.top, args.budget_ms) for module in args.modules]
+    if not all(results):
+        sys.exit(1)
@@ -0,0 +1,72 @@
+"""Copying a week of menus row by row vs with services.copy_menus.
+
+Row by row is what filling MenuAdmin inlines by hand costs: a save per menu
+and per recipe, each firing the cache signals. Both runs are rolled back.
+
+    python benchmarks/menu_planning.py --days 7
+"""
+
+import argparse
+import datetime as dt
+import time
+
+import django
+
+
+class Rollback(Exception):
+    pass
+
+
+def _row_by_row(source_dates: list[dt.date], start: dt.date) -> None:
+    from eda.food import models
+
+    offset = start - source_dates[0]
+    for source in models.Menu.objects.filter(date__in=source_dates):
+        menu, _ = models.Menu.objects.get_or_create(date=source.date + offset)
+        for menu_recipe in source.menu_recipes.all():
+            models.MenuRecipes.objects.create(
+                menu=menu,
+                recipe_id=menu_recipe.recipe_id,
+                mealtime=menu_recipe.mealtime,
+                count=menu_recipe.count,
+            )
+
+
+def _measure(name: str, function) -> None:
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    started = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        try:
+            with transaction.atomic():
+                function()
+                # Commit hooks run on the outermost atomic block, run them here.
+                for _, callback, _ in connection.run_on_commit:
+                    callback()
+                raise Rollback
+        except Rollback:
+            pass
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{name:<12} {len(queries):>5} queries {elapsed:8.1f} ms")
+
+
+def main(days: int) -> None:
+    from eda.food import models, services
+
+    first = models.Menu.objects.order_by("date").values_list("date", flat=True)[0]
+    source_dates = [first + dt.timedelta(days=day) for day in range(days)]
+    last = models.Menu.objects.order_by("-date").values_list("date", flat=True)[0]
+    start = last + dt.timedelta(days=1)
+
+    _measure("row by row", lambda: _row_by_row(source_dates, start))
+    _measure("copy_menus", lambda: services.copy_menus(source_dates, start))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    django.setup()
+    main(args.days)
@@ -0,0 +1,108 @@
+"""Reader latency while a writer keeps committing, stock vs tuned SQLite.
+
+The writer emulates admin saves: a transaction that rewrites a batch of rows.
+Readers emulate the bot: short indexed lookups in a loop.
+
+    python benchmarks/sqlite_concurrency.py --seconds 5 --readers 2
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from eda.core import settings
+
+ROWS = 50_000
+
+
+def _connect(path: str, pragmas: dict) -> sqlite3.Connection:
+    connection = sqlite3.connect(
+        path, timeout=30, isolation_level=None, check_same_thread=False
+    )
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+    return connection
+
+
+def _prepare(path: str, pragmas: dict) -> None:
+    connection = _connect(path, pragmas)
+    connection.execute(
+        "CREATE TABLE recipes (id INTEGER PRIMARY KEY, name TEXT, weight INTEGER)"
+    )
+    connection.executemany(
+        "INSERT INTO recipes (name, weight) VALUES (?, ?)",
+        ((f"recipe {i}", i % 1000) for i in range(ROWS)),
+    )
+    connection.close()
+
+
+def _write(path: str, pragmas: dict, stop: threading.Event) -> int:
+    connection = _connect(path, pragmas)
+    commits = 0
+    while not stop.is_set():
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(
+            "UPDATE recipes SET weight = weight + 1 WHERE id % 10 = ?", (commits % 10,)
+        )
+        connection.execute("COMMIT")
+        commits += 1
+    connection.close()
+    return commits
+
+
+def _read(path: str, pragmas: dict, stop: threading.Event, timings: list) -> None:
+    connection = _connect(path, pragmas)
+    i = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        connection.execute(
+            "SELECT name, weight FROM recipes WHERE id = ?", (i % ROWS + 1,)
+        ).fetchall()
+        timings.append(time.perf_counter() - started)
+        i += 7919
+    connection.close()
+
+
+def run(name: str, pragmas: dict, seconds: float, readers: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.sqlite3")
+        _prepare(path, pragmas)
+        stop = threading.Event()
+        timings: list[float] = []
+        commits = []
+        threads = [
+            threading.Thread(
+                target=lambda: commits.append(_write(path, pragmas, stop))
+            ),
+            *(
+                threading.Thread(target=_read, args=(path, pragmas, stop, timings))
+                for _ in range(readers)
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    quantiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{name:>6}: {len(timings) / seconds:8.0f} reads/s, "
+        f"p50 {quantiles[49] * 1000:7.3f} ms, p99 {quantiles[98] * 1000:7.3f} ms, "
+        f"max {max(timings) * 1000:7.1f} ms, {commits[0]} commits"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    run("stock", {}, args.seconds, args.readers)
+    run("tuned", settings.SQLITE_PRAGMAS, args.seconds, args.readers)
@@ -0,0 +1,170 @@
+"""Times the service layer, message rendering and admin changelists.
+
+Fill the database first, e.g. `python eda/manage.py generate_data --clear`.
+
+    python benchmarks/suite.py --save           # store a baseline
+    python benchmarks/suite.py                  # compare against it
+
+Every case records the median wall time and the number of SQL statements,
+counted across all threads. Exits with status 1 if a case got slower than
+the baseline by more than --tolerance (and --min-delta-ms) or runs more
+queries.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import pathlib
+import statistics
+import sys
+import threading
+import time
+
+import django
+
+BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+# The admin templates would look up hashed names in the manifest that
+# collectstatic writes, the timings don't depend on them.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, statement: str) -> None:
+        statement = statement.lstrip().upper()
+        # With DEBUG on, Django quotes parameters for the query log with QUOTE().
+        if statement.startswith("SELECT QUOTE("):
+            return
+        if statement[:6] in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            with self._lock:
+                self.count += 1
+
+    def install(self, sender, connection, **kwargs) -> None:
+        connection.connection.set_trace_callback(self)
+
+
+def _cases() -> dict:
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.test import RequestFactory
+
+    from eda.food import cache, models, services
+    from eda.telegrambot import messages
+
+    today = dt.date.today()
+    products = list(models.Product.objects.values_list("name", flat=True)[:3])
+    menu_recipes = asyncio.run(services.get_menu_recipes_at(today))
+
+    request = RequestFactory().get("/admin/")
+    request.user = User(is_active=True, is_staff=True, is_superuser=True)
+
+    def changelist(model):
+        def run():
+            admin.site._registry[model].changelist_view(request).render()
+
+        return run
+
+    def cold(function):
+        async def run():
+            cache.invalidate([today + dt.timedelta(days=days) for days in range(14)])
+            await function()
+
+        return run
+
+    async def grocery_list(days):
+        to_date = today + dt.timedelta(days=days - 1)
+        return [item async for item in services.iter_grocery_list(today, to_date)]
+
+    return {
+        "menu cold": cold(lambda: services.get_menu_recipes_at(today)),
+        "menu warm": lambda: services.get_menu_recipes_at(today),
+        "menu message warm": lambda: services.get_menu_message_at(today),
+        "grocery list 2 days cold": cold(
+            lambda: services.get_grocery_list(today, today + dt.timedelta(days=1))
+        ),
+        "grocery list 2 days warm": lambda: services.get_grocery_list(
+            today, today + dt.timedelta(days=1)
+        ),
+        "grocery list 14 days": lambda: grocery_list(14),
+        "what can I cook": lambda: services.what_can_i_cook(products),
+        "messages.menu": lambda: messages.menu(menu_recipes),
+        "MenuAdmin changelist": changelist(models.Menu),
+        "RecipeAdmin changelist": changelist(models.Recipe),
+    }
+
+
+def run(repeat: int) -> dict[str, dict[str, float]]:
+    from django.db.backends.signals import connection_created
+
+    counter = QueryCounter()
+    connection_created.connect(counter.install)
+    from django.db import connections
+
+    # Reconnect so that the counter sees the main thread's queries too.
+    connections.close_all()
+
+    loop = asyncio.new_event_loop()
+    results = {}
+    for name, case in _cases().items():
+        timings, queries = [], []
+        for _ in range(repeat):
+            counter.count = 0
+            started = time.perf_counter()
+            result = case()
+            if asyncio.iscoroutine(result):
+                loop.run_until_complete(result)
+            timings.append(time.perf_counter() - started)
+            queries.append(counter.count)
+        results[name] = {
+            "ms": statistics.median(timings) * 1000,
+            "queries": statistics.median(queries),
+        }
+    loop.close()
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float, min_delta_ms: float
+) -> bool:
+    ok = True
+    for name, result in results.items():
+        line = f"{name:<28} {result['ms']:9.2f} ms {result['queries']:6.0f} queries"
+        if previous := baseline.get(name):
+            change = result["ms"] / previous["ms"] - 1 if previous["ms"] else 0
+            line += f"   {change:+7.1%} vs {previous['ms']:.2f} ms"
+            slower = change > tolerance and result["ms"] - previous["ms"] > min_delta_ms
+            if slower or result["queries"] > previous["queries"]:
+                line += "   REGRESSION"
+                ok = False
+        print(line)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--save", action="store_true", help="Store as the baseline.")
+    args = parser.parse_args()
+
+    django.setup()
+    from django.test import override_settings
+
+    with override_settings(STORAGES=STORAGES):
+        results = run(args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    ok = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved to {args.baseline}")
+    elif not ok:
+        sys.exit(1)
@@ -0,0 +1,63 @@
+"""Per-send latency of a fresh Application per delivery vs a shared bot.
+
+python benchmarks/telegram_client.py --sends 50 --handshake-delay 0.05
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fake_telegram import FakeTelegram
+
+from eda.core import settings
+
+
+async def _fresh_client(sends: int) -> list[float]:
+    from eda.telegrambot import utils
+
+    timings = []
+    for _ in range(sends):
+        started = time.perf_counter()
+        await utils.get_telegram().bot.send_message(1, "menu")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def _shared_client(sends: int) -> list[float]:
+    from eda.telegrambot import utils
+
+    timings = []
+    async with utils.get_telegram().bot as bot:
+        for _ in range(sends):
+            started = time.perf_counter()
+            await bot.send_message(1, "menu")
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _report(name: str, timings: list[float], connections: int) -> None:
+    print(
+        f"{name:>8}: median {statistics.median(timings) * 1000:7.2f} ms, "
+        f"p95 {statistics.quantiles(timings, n=20)[-1] * 1000:7.2f} ms, "
+        f"{connections} connections"
+    )
+
+
+async def main(sends: int, handshake_delay: float) -> None:
+    for name, run in (("fresh", _fresh_client), ("shared", _shared_client)):
+        async with FakeTelegram(handshake_delay=handshake_delay) as fake:
+            settings.TELEGRAM_API_URL = fake.url
+            _report(name, await run(sends), fake.connections)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sends", type=int, default=50)
+    parser.add_argument("--handshake-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    asyncio.run(main(args.sends, args.handshake_delay))
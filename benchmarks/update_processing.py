@@ -0,0 +1,78 @@
+"""Sequential vs chat-ordered concurrent update processing.
+
+Feeds updates from several chats through the bot's update processor with a
+handler that sleeps for --delay, e.g. a slow grocery list. Checks that each
+chat's updates ran in the order they arrived.
+
+    python benchmarks/update_processing.py --chats 10 --updates 5 --delay 0.05
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from telegram import Update
+
+from eda.telegrambot import updates
+
+
+def _update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": "/list",
+            },
+        },
+        None,
+    )
+
+
+async def _run(workers: int, chats: int, per_chat: int, delay: float) -> bool:
+    processor = updates.ChatOrderedUpdateProcessor(workers, max_pending=256)
+    handled: dict[int, list[int]] = {chat_id: [] for chat_id in range(chats)}
+
+    async def handle(update: Update) -> None:
+        await asyncio.sleep(delay)
+        handled[update.effective_chat.id].append(update.update_id)
+
+    # Interleave the chats as a busy group of users would.
+    batch = [
+        _update(index * chats + chat_id, chat_id)
+        for index in range(per_chat)
+        for chat_id in range(chats)
+    ]
+    started = time.perf_counter()
+    # Mirrors Application: one task per update, created in arrival order.
+    await asyncio.gather(
+        *(processor.process_update(update, handle(update)) for update in batch)
+    )
+    elapsed = time.perf_counter() - started
+    ordered = all(ids == sorted(ids) for ids in handled.values())
+    print(
+        f"workers={workers:<3} {len(batch)} updates in {elapsed:6.2f} s,"
+        f" per-chat order {'kept' if ordered else 'BROKEN'}"
+    )
+    return ordered
+
+
+async def main(chats: int, per_chat: int, delay: float, workers: int) -> bool:
+    sequential = await _run(1, chats, per_chat, delay)
+    concurrent = await _run(workers, chats, per_chat, delay)
+    return sequential and concurrent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=5, help="Per chat.")
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if not asyncio.run(main(args.chats, args.updates, args.delay, args.workers)):
+        sys.exit(1)
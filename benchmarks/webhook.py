@@ -0,0 +1,120 @@
+"""End-to-end check of webhook mode against a local fake Telegram server.
+
+Runs the ASGI app in-process with its lifespan, posts /help updates from
+different chats to the webhook and waits until the replies reach the fake
+server. Exits with status
+1 if the secret token is not enforced or a reply is missing.
+
+    python benchmarks/webhook.py --updates 20 --delay 0.1
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from fake_telegram import FakeTelegram
+
+from eda.core import settings
+
+SECRET = "webhook-secret"
+
+
+def _update(update_id: int) -> dict:
+    # One chat per update: updates from the same chat are handled in order.
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": update_id, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": "/help",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 5}],
+        },
+    }
+
+
+class Lifespan:
+    def __init__(self, application) -> None:
+        self._application = application
+        self._receive: asyncio.Queue = asyncio.Queue()
+        self._send: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self) -> None:
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+        self._task = asyncio.create_task(
+            self._application(scope, self._receive.get, self._send.put)
+        )
+        await self._receive.put({"type": "lifespan.startup"})
+        message = await self._send.get()
+        assert message["type"] == "lifespan.startup.complete", message
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._receive.put({"type": "lifespan.shutdown"})
+        await self._send.get()
+        await self._task
+
+
+async def main(updates: int, delay: float) -> bool:
+    async with FakeTelegram(delay=delay) as fake:
+        settings.TELEGRAM_API_URL = fake.url
+        settings.TELEGRAM_WEBHOOK_SECRET = SECRET
+
+        from eda.core.asgi import application
+
+        transport = httpx.ASGITransport(app=application)
+        async with (
+            Lifespan(application),
+            httpx.AsyncClient(
+                transport=transport, base_url="http://localhost"
+            ) as client,
+        ):
+            response = await client.post(
+                "/telegram/webhook",
+                json=_update(0),
+                headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+            )
+            forbidden = response.status_code == 403
+            print(f"wrong secret token: {response.status_code}")
+
+            async def post(update_id: int) -> float:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/telegram/webhook",
+                    json=_update(update_id),
+                    headers={"X-Telegram-Bot-Api-Secret-Token": SECRET},
+                )
+                response.raise_for_status()
+                return time.perf_counter() - started
+
+            started = time.perf_counter()
+            latencies = await asyncio.gather(
+                *(post(update_id) for update_id in range(1, updates + 1))
+            )
+            while len(_replies(fake)) < updates:
+                if time.perf_counter() - started > 10 + updates * delay:
+                    break
+                await asyncio.sleep(0.005)
+            elapsed = time.perf_counter() - started
+
+    replies = len(_replies(fake))
+    print(f"webhook response: median {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"{replies}/{updates} replies in {elapsed:.2f} s (API delay {delay} s)")
+    return forbidden and replies == updates
+
+
+def _replies(fake: FakeTelegram) -> list:
+    return [request for request in fake.requests if request[0] == "sendMessage"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if not asyncio.run(main(args.updates, args.delay)):
+        sys.exit(1)
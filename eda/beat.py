@@ -1,50 +1,72 @@
 import asyncio
-import collections
 import datetime as dt
+import functools
+import logging
+import os
+import signal
 
 import django
-import pytz
-from scheduler.asyncio import Scheduler
+from telegram import Bot
 from telegram.constants import ParseMode
 
+# Workers skip the admin apps, see eda.core.worker_settings.
+os.environ["DJANGO_SETTINGS_MODULE"] = "eda.core.worker_settings"
 django.setup()
 
-from eda.core import settings  # noqa: E402
-from eda.food import models, services  # noqa: E402
-from eda.telegrambot import messages, utils  # noqa: E402
+from eda.core import metrics, settings  # noqa: E402
+from eda.food import models, scheduling, services  # noqa: E402
+from eda.telegrambot import dispatch, messages, utils  # noqa: E402
 
+logger = logging.getLogger(__name__)
 
-async def _send_menu(
-    menu: collections.defaultdict[str, list[str]], menu_date: dt.date
-) -> None:
-    if menu_message := messages.menu(menu):
-        bot = utils.get_telegram().bot
-        await bot.send_message(settings.TELEGRAM_CHAT_ID, messages.menu_date(menu_date))
-        await bot.send_message(
-            settings.TELEGRAM_CHAT_ID, menu_message, parse_mode=ParseMode.MARKDOWN_V2
+
+async def _send_menu(bot: Bot, menu_message: str, menu_date: dt.date) -> None:
+    if menu_message:
+        chat_ids = [
+            settings.TELEGRAM_CHAT_ID,
+            *await services.get_subscriber_chat_ids(),
+        ]
+        results = await dispatch.Dispatcher(bot).broadcast(
+            chat_ids,
+            [
+                (messages.menu_date(menu_date), {}),
+                (menu_message, {"parse_mode": ParseMode.MARKDOWN_V2}),
+            ],
         )
+        logger.info("Menu for %s delivered: %s", menu_date, dict(results))
 
 
-async def send_today_menu() -> None:
+@metrics.instrument("job")
+async def send_today_menu(bot: Bot) -> None:
     menu_date = dt.date.today()
     try:
-        menu = await services.get_menu_recipes_at(menu_date)
+        menu_message = await services.get_menu_message_at(menu_date)
     except models.Menu.DoesNotExist:
         return None
     else:
-        await _send_menu(menu, menu_date)
+        await _send_menu(bot, menu_message, menu_date)
 
 
-async def main():
-    schedule = Scheduler(tzinfo=dt.UTC)
+def get_jobs(bot: Bot) -> list[scheduling.DailyJob]:
+    return [
+        scheduling.DailyJob(
+            "send_today_menu",
+            dt.time(hour=7, minute=30),
+            functools.partial(send_today_menu, bot),
+        ),
+    ]
 
-    schedule.daily(
-        dt.time(hour=7, minute=30, tzinfo=pytz.timezone("Europe/Moscow")),
-        send_today_menu,
-    )
 
-    while True:
-        await asyncio.sleep(1)
+async def main():
+    metrics.start_dumping("beat", settings.METRICS_DIR, settings.METRICS_DUMP_INTERVAL)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    # One initialized bot for the whole process keeps its HTTP connections alive.
+    async with utils.get_bot() as bot:
+        await scheduling.Scheduler(get_jobs(bot)).run(stop)
 
 
 if __name__ == "__main__":
@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from eda.core import static  # noqa: E402
+from eda.telegrambot import webhook  # noqa: E402
+
+http_application = static.StaticFilesApplication(django_application)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await webhook.lifespan(scope, receive, send)
+    else:
+        await http_application(scope, receive, send)
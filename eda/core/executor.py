@@ -0,0 +1,17 @@
+import concurrent.futures
+from collections.abc import Callable
+
+from asgiref.sync import sync_to_async
+
+from eda.core import settings
+
+# Blocking work that is not database access, such as the file cache, runs on
+# this pool instead of spawning a default executor thread per call. Async ORM
+# calls go through Django's own thread-sensitive executor.
+executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=settings.SYNC_EXECUTOR_WORKERS, thread_name_prefix="eda-sync"
+)
+
+
+def run_sync(function: Callable) -> Callable:
+    return sync_to_async(function, thread_sensitive=False, executor=executor)
@@ -0,0 +1,288 @@
+"""In-process metrics in the Prometheus text format.
+
+Wrap bot handlers, jobs and services with `instrument` to record their
+latency, the number of SQL queries they ran and the time spent in the
+database. Queries are attributed through a context variable, so queries
+made in `sync_to_async` threads count towards the caller.
+
+The web process serves its own metrics together with the dumps written by
+the worker processes (see `start_dumping`) at `/metrics`.
+"""
+
+import atexit
+import bisect
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import inspect
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_lock = threading.Lock()
+_registry: dict[str, "_Metric"] = {}
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._series: dict[tuple[tuple[str, str], ...], list[float]] = {}
+        _registry[name] = self
+
+    def _get(self, labels: dict[str, str], size: int) -> list[float]:
+        key = tuple(sorted(labels.items()))
+        if (series := self._series.get(key)) is None:
+            series = self._series[key] = [0.0] * size
+        return series
+
+    def render(self, labels: dict[str, str]) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        with _lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            yield from self._render_series({**labels, **dict(key)}, values)
+
+    def _render_series(self, labels: dict[str, str], values: list[float]):
+        yield f"{self.name}{_format_labels(labels)} {values[0]:g}"
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        with _lock:
+            self._get(labels, 1)[0] += amount
+
+    def values(self) -> dict[tuple[tuple[str, str], ...], float]:
+        with _lock:
+            return {key: values[0] for key, values in self._series.items()}
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with _lock:
+            self._get(labels, 1)[0] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS) -> None:
+        super().__init__(name, help)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: str) -> None:
+        # Layout: one count per bucket, then +Inf count and sum.
+        with _lock:
+            series = self._get(labels, len(self.buckets) + 2)
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def _render_series(self, labels: dict[str, str], values: list[float]):
+        total = 0.0
+        for bound, count in zip([*self.buckets, "+Inf"], values[:-1]):
+            total += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            yield f"{self.name}_bucket{_format_labels({**labels, 'le': le})} {total:g}"
+        yield f"{self.name}_sum{_format_labels(labels)} {values[-1]:g}"
+        yield f"{self.name}_count{_format_labels(labels)} {total:g}"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+operation_seconds = Histogram(
+    "eda_operation_seconds", "Latency of handlers, jobs and services."
+)
+operation_queries = Histogram(
+    "eda_operation_queries", "SQL queries per operation call.", QUERY_BUCKETS
+)
+operation_db_seconds = Histogram(
+    "eda_operation_db_seconds", "Time spent in the database per operation call."
+)
+operation_errors = Counter(
+    "eda_operation_errors_total", "Operation calls that raised an exception."
+)
+telegram_request_seconds = Histogram(
+    "eda_telegram_request_seconds", "Latency of Telegram Bot API requests."
+)
+
+
+@dataclasses.dataclass
+class _Scope:
+    queries: int = 0
+    db_seconds: float = 0.0
+    seconds: float = 0.0
+
+
+_scopes: contextvars.ContextVar[tuple[_Scope, ...]] = contextvars.ContextVar(
+    "metrics_scopes", default=()
+)
+
+
+@receiver(connection_created)
+def _install_execute_wrapper(sender, connection, **kwargs) -> None:
+    connection.execute_wrappers.append(_execute_wrapper)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    if not (scopes := _scopes.get()):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for scope in scopes:
+            scope.queries += 1
+            scope.db_seconds += elapsed
+
+
+@contextlib.contextmanager
+def _enter(scope: _Scope, kind: str, name: str) -> Iterator[None]:
+    token = _scopes.set((*_scopes.get(), scope))
+    started = time.perf_counter()
+    try:
+        yield
+    except StopAsyncIteration:
+        raise
+    except Exception:
+        operation_errors.inc(kind=kind, name=name)
+        raise
+    finally:
+        _scopes.reset(token)
+        scope.seconds += time.perf_counter() - started
+
+
+def _record(scope: _Scope, kind: str, name: str) -> None:
+    operation_seconds.observe(scope.seconds, kind=kind, name=name)
+    operation_queries.observe(scope.queries, kind=kind, name=name)
+    operation_db_seconds.observe(scope.db_seconds, kind=kind, name=name)
+
+
+@contextlib.contextmanager
+def measure(kind: str, name: str) -> Iterator[None]:
+    scope = _Scope()
+    try:
+        with _enter(scope, kind, name):
+            yield
+    finally:
+        _record(scope, kind, name)
+
+
+def instrument(kind: str) -> Callable[[Callable], Callable]:
+    """Records metrics for every call of a function, coroutine or async generator.
+
+    Async generators are only measured while they produce items, not while the
+    caller consumes them.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        name = function.__name__
+        if inspect.isasyncgenfunction(function):
+
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                scope = _Scope()
+                generator = function(*args, **kwargs)
+                try:
+                    while True:
+                        try:
+                            with _enter(scope, kind, name):
+                                item = await anext(generator)
+                        except StopAsyncIteration:
+                            break
+                        yield item
+                finally:
+                    await generator.aclose()
+                    _record(scope, kind, name)
+
+        elif iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with measure(kind, name):
+                    return await function(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with measure(kind, name):
+                    return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def render(**labels: str) -> str:
+    lines = []
+    for metric in list(_registry.values()):
+        lines.extend(metric.render(labels))
+    return "\n".join(lines) + "\n"
+
+
+def render_all(directory: pathlib.Path | None, **labels: str) -> str:
+    """Merges this process' metrics with the dumps found in `directory`."""
+    families: dict[str, list[str]] = {}
+    texts = [render(**labels)]
+    if directory is not None and directory.is_dir():
+        texts.extend(path.read_text() for path in sorted(directory.glob("*.prom")))
+    for text in texts:
+        family: list[str] = []
+        for line in text.splitlines():
+            if line.startswith("# HELP "):
+                name = line.split()[2]
+                family = families.setdefault(name, [])
+                if not family:
+                    family.append(line)
+            elif line.startswith("# TYPE "):
+                if len(family) == 1:
+                    family.append(line)
+            elif line:
+                family.append(line)
+    return "\n".join(line for family in families.values() for line in family) + "\n"
+
+
+def dump(path: pathlib.Path, **labels: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(render(**labels))
+    os.replace(temporary, path)
+
+
+def start_dumping(process: str, directory: pathlib.Path, interval: float) -> None:
+    """Periodically writes this worker's metrics to `directory/<process>.prom`."""
+    path = directory / f"{process}.prom"
+
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            dump(path, process=process)
+
+    threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+    atexit.register(dump, path, process=process)
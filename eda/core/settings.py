@@ -1,3 +1,4 @@
+import ipaddress
 from pathlib import Path
 
 import environ
@@ -23,15 +24,66 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Admin autocomplete answers are cached briefly per query and page.
+AUTOCOMPLETE_CACHE_TIMEOUT = env.int("AUTOCOMPLETE_CACHE_TIMEOUT", default=60)
+
+BEAT_GRACE_PERIOD = env.int("BEAT_GRACE_PERIOD", default=60 * 60)
+BEAT_LEASE = env.int("BEAT_LEASE", default=5 * 60)
+
+TELEGRAM_API_URL = env.str("TELEGRAM_API_URL", default="https://api.telegram.org/bot")
 TELEGRAM_CHAT_ID = env.int("TELEGRAM_CHAT_ID")
+TELEGRAM_KEEPALIVE_EXPIRY = env.float("TELEGRAM_KEEPALIVE_EXPIRY", default=60.0)
+TELEGRAM_POOL_SIZE = env.int("TELEGRAM_POOL_SIZE", default=8)
 TELEGRAM_TOKEN = env.str("TELEGRAM_TOKEN")
+# With a secret set, the ASGI app receives updates at TELEGRAM_WEBHOOK_URL
+# instead of bot.py polling for them. Register it with `manage.py set_webhook`.
+TELEGRAM_WEBHOOK_SECRET = env.str("TELEGRAM_WEBHOOK_SECRET", default="")
+TELEGRAM_WEBHOOK_URL = env.str("TELEGRAM_WEBHOOK_URL", default="")
+
+# Updates from different chats are handled concurrently, each chat in order.
+BOT_CONCURRENT_UPDATES = env.int("BOT_CONCURRENT_UPDATES", default=8)
+BOT_MAX_PENDING_UPDATES = env.int("BOT_MAX_PENDING_UPDATES", default=256)
+
+BROADCAST_CONCURRENCY = env.int("BROADCAST_CONCURRENCY", default=TELEGRAM_POOL_SIZE)
+BROADCAST_GLOBAL_RATE = env.float("BROADCAST_GLOBAL_RATE", default=30.0)
+BROADCAST_MAX_RETRIES = env.int("BROADCAST_MAX_RETRIES", default=3)
+
+DATABASE_PATH = Path(env.str("DATABASE_PATH"))
+
+# Bot, beat and admin run as separate processes, so the default cache has to be
+# shared between them for signal-based invalidation to work.
+CACHES = {
+    "default": env.cache(
+        "CACHE_URL", default=f"filecache://{DATABASE_PATH.parent / 'cache'}"
+    )
+}
 
 CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS")
 
+# Admin, bot and beat share one SQLite file: WAL lets readers run while the
+# admin writes, and IMMEDIATE transactions take the write lock up front so
+# writers wait on busy_timeout instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": env.str("SQLITE_JOURNAL_MODE", default="WAL"),
+    "synchronous": env.str("SQLITE_SYNCHRONOUS", default="NORMAL"),
+    "mmap_size": env.int("SQLITE_MMAP_SIZE", default=128 * 1024 * 1024),
+    "cache_size": env.int("SQLITE_CACHE_SIZE", default=-16 * 1024),
+    "temp_store": env.str("SQLITE_TEMP_STORE", default="MEMORY"),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": env.str("DATABASE_PATH"),
+        "NAME": DATABASE_PATH,
+        "CONN_MAX_AGE": env.int("DATABASE_CONN_MAX_AGE", default=600),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name} = {value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+            "timeout": env.float("SQLITE_BUSY_TIMEOUT", default=5.0),
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
@@ -39,6 +91,8 @@ DEBUG = env("DEBUG")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+GROCERY_CACHE_DAYS = env.int("GROCERY_CACHE_DAYS", default=7)
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -51,6 +105,22 @@ INSTALLED_APPS = [
 
 LANGUAGE_CODE = "ru-ru"
 
+MENU_CACHE_TIMEOUT = env.int("MENU_CACHE_TIMEOUT", default=7 * 24 * 60 * 60)
+
+# Bot and beat dump their metrics here, the admin serves them at /metrics.
+METRICS_DIR = Path(
+    env.str("METRICS_DIR", default=str(DATABASE_PATH.parent / "metrics"))
+)
+METRICS_DUMP_INTERVAL = env.float("METRICS_DUMP_INTERVAL", default=15.0)
+# Besides staff users, only these addresses can read /metrics. Behind a reverse
+# proxy every request comes from the proxy, so don't list its address.
+METRICS_ALLOWED_NETWORKS = [
+    ipaddress.ip_network(network)
+    for network in env.list(
+        "METRICS_ALLOWED_NETWORKS", default=["127.0.0.0/8", "::1/128"]
+    )
+]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -65,8 +135,21 @@ ROOT_URLCONF = "eda.core.urls"
 
 SECRET_KEY = env("SECRET_KEY")
 
+# Threads for blocking non-ORM work in the bot and beat, see eda.core.executor.
+SYNC_EXECUTOR_WORKERS = env.int("SYNC_EXECUTOR_WORKERS", default=4)
+
 STATIC_URL = "static/"
-STATIC_ROOT = BASE_DIR / "static"
+STATIC_ROOT = Path(env.str("STATIC_ROOT", default=str(BASE_DIR / "static")))
+
+# collectstatic writes content-hashed copies with .gz and .br versions next to
+# them. WhiteNoise serves those in front of Django (see eda.core.static), hashed
+# names with a far-future immutable Cache-Control.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    },
+}
 
 TIME_ZONE = "Europe/Moscow"
 
@@ -0,0 +1,70 @@
+"""Serves the collected static files straight from the ASGI event loop.
+
+WhiteNoise finds the file, picks its Brotli or gzip version and builds the
+caching headers. Only the bytes are sent here, so static requests never wait
+behind sync admin views for a thread. Under WSGI they are served by the
+same lookup in front of Django, so no middleware slows down other requests.
+"""
+
+import asyncio
+
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import decode_path_info
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _StaticFiles:
+    def __init__(self, application) -> None:
+        self.application = application
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def _find(self, path: str):
+        if self.whitenoise.autorefresh:
+            return self.whitenoise.find_file(path)
+        return self.whitenoise.files.get(path)
+
+
+class StaticFilesWSGIApplication(_StaticFiles):
+    def __call__(self, environ, start_response):
+        path = decode_path_info(environ.get("PATH_INFO", ""))
+        if static_file := self._find(path):
+            return WhiteNoise.serve(static_file, environ, start_response)
+        return self.application(environ, start_response)
+
+
+class StaticFilesApplication(_StaticFiles):
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and (static_file := self._find(scope["path"])):
+            await self._serve(static_file, scope, send)
+        else:
+            await self.application(scope, receive, send)
+
+    @staticmethod
+    async def _serve(static_file, scope, send) -> None:
+        # WhiteNoise reads request headers the WSGI way.
+        environ = {
+            f"HTTP_{name.decode('latin-1').upper().replace('-', '_')}": value.decode(
+                "latin-1"
+            )
+            for name, value in scope["headers"]
+        }
+        response = static_file.get_response(scope["method"], environ)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in response.headers
+                ],
+            }
+        )
+        if response.file is not None:
+            with response.file:
+                while chunk := await asyncio.to_thread(response.file.read, CHUNK_SIZE):
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+        await send({"type": "http.response.body"})
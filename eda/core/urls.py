@@ -18,6 +18,18 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
+from eda.core import views
+from eda.telegrambot import webhook
+
 urlpatterns = [
+    # Shadows the admin's own autocomplete URL, which the widgets reverse.
+    path(
+        "admin/autocomplete/",
+        admin.site.admin_view(
+            views.CachedAutocompleteJsonView.as_view(admin_site=admin.site)
+        ),
+    ),
     path("admin/", admin.site.urls),
+    path("metrics", views.metrics_view, name="metrics"),
+    path("telegram/webhook", webhook.webhook_view, name="telegram-webhook"),
 ]
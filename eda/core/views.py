@@ -0,0 +1,51 @@
+import hashlib
+import ipaddress
+
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from eda.core import metrics, settings
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    if not (request.user.is_staff or _is_allowed_address(request)):
+        raise PermissionDenied
+    return HttpResponse(
+        metrics.render_all(settings.METRICS_DIR, process="admin"),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def _is_allowed_address(request: HttpRequest) -> bool:
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in network for network in settings.METRICS_ALLOWED_NETWORKS)
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    """The admin's autocomplete view, with answers cached for a short time.
+
+    Permissions are checked before the cache, the answer only depends on the
+    query string then.
+    """
+
+    def get(self, request, *args, **kwargs):
+        _, model_admin, source_field, _ = self.process_request(request)
+        self.model_admin, self.source_field = model_admin, source_field
+        if not self.has_perm(request):
+            raise PermissionDenied
+        query = hashlib.sha256(
+            request.GET.urlencode().encode(), usedforsecurity=False
+        ).hexdigest()
+        key = f"admin:autocomplete:{query}"
+        if (content := cache.get(key)) is None:
+            response = super().get(request, *args, **kwargs)
+            cache.set(key, response.content, settings.AUTOCOMPLETE_CACHE_TIMEOUT)
+            return response
+        return HttpResponse(content, content_type="application/json")
@@ -0,0 +1,14 @@
+"""Settings for bot.py, beat.py and worker.py.
+
+The workers only use the food models and the database, so the admin, auth,
+sessions, messages, static files and templates are left out to keep their
+startup short.
+"""
+
+from eda.core.settings import *  # noqa: F401, F403
+
+INSTALLED_APPS = ["eda.food"]
+
+MIDDLEWARE = []
+
+TEMPLATES = []
@@ -13,4 +13,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+from eda.core import static  # noqa: E402
+
+application = static.StaticFilesWSGIApplication(django_application)
@@ -1,20 +1,67 @@
 import datetime as dt
 
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.db.models import Prefetch
+from django.template.response import TemplateResponse
+from django.urls import reverse
 
-from eda.food import models
+from eda.food import models, search, services
 
 
 class IngredientInline(admin.TabularInline):
+    autocomplete_fields = ["product"]
     model = models.Ingredient
     extra = 1
 
 
 class MenuRecipeInline(admin.TabularInline):
+    autocomplete_fields = ["recipe"]
     model = models.MenuRecipes
     extra = 3
 
 
+def _search_name_prefix(queryset, search_term: str):
+    # A range on the indexed key: SQLite's LIKE ignores the index and only
+    # folds ASCII case.
+    if not (prefix := models.name_key(search_term.strip())):
+        return queryset
+    return queryset.filter(
+        name_key__gte=prefix, name_key__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    ).order_by("name_key")
+
+
+def _rollup(recipe: models.Recipe) -> models.RecipeRollup:
+    # Recipes written in bulk have none until rebuild_rollups runs.
+    return getattr(recipe, "rollup", None) or models.RecipeRollup()
+
+
+def _is_autocomplete(request) -> bool:
+    return request.path == reverse("admin:autocomplete")
+
+
+class PlanMenusForm(forms.Form):
+    start = forms.DateField(label="Начиная с", widget=forms.DateInput({"type": "date"}))
+    replace = forms.BooleanField(
+        label="Заменить существующие меню", required=False, initial=False
+    )
+
+
+class RepeatMenusForm(PlanMenusForm):
+    until = forms.DateField(label="По", widget=forms.DateInput({"type": "date"}))
+    every_days = forms.IntegerField(label="Каждые N дней", min_value=1, initial=7)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if (
+            (start := cleaned_data.get("start"))
+            and (until := cleaned_data.get("until"))
+            and until < start
+        ):
+            raise forms.ValidationError("Дата окончания раньше даты начала")
+        return cleaned_data
+
+
 @admin.register(models.Tag)
 class TagAdmin(admin.ModelAdmin):
     list_display = ["name"]
@@ -23,32 +70,64 @@ class TagAdmin(admin.ModelAdmin):
 @admin.register(models.Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ["name"]
+    search_fields = ["name"]
+
+    def get_search_results(self, request, queryset, search_term):
+        return _search_name_prefix(queryset, search_term), False
 
 
 @admin.register(models.Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     fields = ["name", "how_to", "num_portions", "tags"]
     inlines = [IngredientInline]
-    list_display = ["name", "num_portions", "tags_"]
+    list_display = [
+        "name",
+        "num_portions",
+        "ingredient_count",
+        "weight_per_portion",
+        "tags_",
+    ]
     search_fields = ["name"]
 
     def get_queryset(self, request):
-        return (
-            super()
-            .get_queryset(request)
-            .prefetch_related(
-                "tags",
-            )
-        )
+        return super().get_queryset(request).select_related("rollup")
+
+    def ingredient_count(self, obj: models.Recipe) -> int:
+        return _rollup(obj).ingredient_count
+
+    ingredient_count.short_description = "Ингредиентов"
+    ingredient_count.admin_order_field = "rollup__ingredient_count"
 
-    def tags_(self, obj: models.Menu) -> bool:
-        return ", ".join(tag.name for tag in obj.tags.all())
+    def weight_per_portion(self, obj: models.Recipe) -> int:
+        return round(_rollup(obj).weight_per_portion)
+
+    weight_per_portion.short_description = "Вес порции, г"
+    weight_per_portion.admin_order_field = "rollup__weight_per_portion"
+
+    def tags_(self, obj: models.Recipe) -> str:
+        return _rollup(obj).tag_names
 
     tags_.short_description = "Теги"
 
+    def get_search_results(self, request, queryset, search_term):
+        if _is_autocomplete(request):
+            return _search_name_prefix(queryset, search_term), False
+        # Full-text search over names, instructions, products and tags.
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(id__in=search.matching_ids(search_term)), False
+
+
+@admin.register(models.Subscriber)
+class SubscriberAdmin(admin.ModelAdmin):
+    list_display = ["chat_id", "name", "is_active"]
+    list_filter = ["is_active"]
+    search_fields = ["name"]
+
 
 @admin.register(models.Menu)
 class MenuAdmin(admin.ModelAdmin):
+    actions = ["copy_menus", "repeat_menus"]
     inlines = [MenuRecipeInline]
     list_display = ["date", "is_today", "breakfast", "lunch", "dinner"]
 
@@ -57,8 +136,10 @@ class MenuAdmin(admin.ModelAdmin):
             super()
             .get_queryset(request)
             .prefetch_related(
-                "menu_recipes",
-                "menu_recipes__recipe",
+                Prefetch(
+                    "menu_recipes",
+                    queryset=models.MenuRecipes.objects.select_related("recipe"),
+                )
             )
         )
 
@@ -78,8 +159,52 @@ class MenuAdmin(admin.ModelAdmin):
 
     @staticmethod
     def _format_mealtime_recipes(menu: models.Menu, mealtime) -> str:
-        qs = menu.menu_recipes.filter(mealtime=mealtime)
-        return ", ".join([str(recipe.recipe) for recipe in qs.all()])
+        # Filtering the prefetched rows in Python keeps the page at two queries.
+        return ", ".join(
+            str(menu_recipe.recipe)
+            for menu_recipe in menu.menu_recipes.all()
+            if menu_recipe.mealtime == mealtime
+        )
+
+    @admin.action(description="Скопировать выбранные меню на другие даты")
+    def copy_menus(self, request, queryset):
+        return self._plan_menus(request, queryset, PlanMenusForm, services.copy_menus)
+
+    @admin.action(description="Повторять выбранные меню каждые N дней")
+    def repeat_menus(self, request, queryset):
+        return self._plan_menus(
+            request, queryset, RepeatMenusForm, services.repeat_menus
+        )
+
+    def _plan_menus(self, request, queryset, form_class, plan):
+        # The selected menus are the template, the form picks the target dates.
+        form = form_class(request.POST if "apply" in request.POST else None)
+        if form.is_valid():
+            try:
+                planned = plan(
+                    queryset.values_list("date", flat=True), **form.cleaned_data
+                )
+            except ValueError as e:
+                self.message_user(request, str(e), messages.ERROR)
+                return None
+            message = f"Заполнено меню: {len(planned.written)}"
+            if planned.skipped:
+                message += f", пропущено занятых дат: {len(planned.skipped)}"
+            self.message_user(request, message, messages.SUCCESS)
+            return None
+        return TemplateResponse(
+            request,
+            "admin/food/menu/plan_menus.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": self.get_actions(request)[request.POST["action"]][2],
+                "opts": self.model._meta,
+                "form": form,
+                "menus": queryset,
+                "action": request.POST["action"],
+                "action_checkbox_name": admin.helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
 
     is_today.boolean = True  # type: ignore
     is_today.short_description = "Сегодня"
@@ -5,3 +5,6 @@ class MenuConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "eda.food"
     verbose_name = "Еда"
+
+    def ready(self) -> None:
+        from eda.food import signals  # noqa: F401
@@ -0,0 +1,95 @@
+import datetime as dt
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import cache
+
+from eda.core import executor, metrics, settings
+
+NAMESPACES = ("menu", "message", "grocery")
+
+_events = metrics.Counter(
+    "eda_cache_events_total", "Menu cache hits, misses and invalidations."
+)
+
+
+def _key(namespace: str, date: dt.date) -> str:
+    return f"food:{namespace}:{date.isoformat()}"
+
+
+def _version_key(date: dt.date) -> str:
+    return f"food:version:{date.isoformat()}"
+
+
+# Entries are stamped with the version their date had before the database was
+# read. invalidate() bumps it, so an entry read before a commit and written
+# after the commit's invalidation is never served.
+
+
+def get_many(
+    namespace: str, dates: Iterable[dt.date]
+) -> tuple[dict[dt.date, Any], dict[dt.date, int]]:
+    """Returns the cached values and the versions to cache the missing ones with."""
+    dates = set(dates)
+    found = cache.get_many(
+        [_key(namespace, date) for date in dates]
+        + [_version_key(date) for date in dates]
+    )
+    versions = _versions(dates, found)
+    values = {}
+    for date in dates:
+        if (entry := found.get(_key(namespace, date))) and entry[0] == versions[date]:
+            values[date] = entry[1]
+    _events.inc(len(values), event=f"{namespace}_hits")
+    _events.inc(len(dates) - len(values), event=f"{namespace}_misses")
+    return values, versions
+
+
+def get_versions(dates: Iterable[dt.date]) -> dict[dt.date, int]:
+    dates = set(dates)
+    return _versions(dates, cache.get_many([_version_key(date) for date in dates]))
+
+
+def _versions(dates: set[dt.date], found: dict[str, Any]) -> dict[dt.date, int]:
+    versions = {}
+    for date in dates:
+        key = _version_key(date)
+        if (version := found.get(key)) is None:
+            # An evicted version must not validate old entries either.
+            version = time.time_ns()
+            cache.add(key, version, timeout=None)
+            version = cache.get(key, version)
+        versions[date] = version
+    return versions
+
+
+def set_many(
+    namespace: str, values: dict[dt.date, Any], versions: dict[dt.date, int]
+) -> None:
+    cache.set_many(
+        {
+            _key(namespace, date): (versions[date], value)
+            for date, value in values.items()
+        },
+        timeout=settings.MENU_CACHE_TIMEOUT,
+    )
+
+
+aget_many = executor.run_sync(get_many)
+aset_many = executor.run_sync(set_many)
+
+
+def invalidate(dates: Iterable[dt.date]) -> None:
+    dates = set(dates)
+    cache.set_many({_version_key(date): time.time_ns() for date in dates}, timeout=None)
+    cache.delete_many(
+        [_key(namespace, date) for date in dates for namespace in NAMESPACES]
+    )
+    _events.inc(event="invalidations")
+
+
+def get_stats() -> dict[str, int]:
+    return {
+        dict(labels)["event"]: int(value) for labels, value in _events.values().items()
+    }
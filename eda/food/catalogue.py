@@ -0,0 +1,274 @@
+"""Streaming export and batched import of the food catalogue.
+
+A catalogue is a stream of flat records keyed by natural keys (names and
+dates). JSON Lines files mix all kinds with a "type" field, CSV files hold a
+single kind with the columns from `FIELDS`. Kinds are listed in dependency
+order, which is also the order they are exported in.
+
+Imports add and update rows but never delete them, except that a menu's
+recipes are replaced by the ones in the stream.
+"""
+
+import collections
+import datetime as dt
+from collections.abc import Iterable, Iterator
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from eda.food import cache, cooking, models, rollups, search
+
+FIELDS = {
+    "product": ["name", "show_in_grocery_list"],
+    "tag": ["name"],
+    "recipe": ["name", "num_portions", "how_to"],
+    "recipe_tag": ["recipe", "tag"],
+    "ingredient": ["recipe", "product", "weight"],
+    "menu": ["date"],
+    "menu_recipe": ["date", "recipe", "mealtime", "count"],
+}
+KINDS = list(FIELDS)
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export(kind: str) -> Iterator[dict]:
+    """Yields the records of one kind without loading them all at once."""
+    fields = FIELDS[kind]
+    for values in _export_queryset(kind).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield dict(zip(fields, values))
+
+
+def _export_queryset(kind: str) -> QuerySet:
+    match kind:
+        case "product":
+            return models.Product.objects.values_list("name", "show_in_grocery_list")
+        case "tag":
+            return models.Tag.objects.values_list("name")
+        case "recipe":
+            return models.Recipe.objects.values_list("name", "num_portions", "how_to")
+        case "recipe_tag":
+            return models.Recipe.tags.through.objects.order_by("id").values_list(
+                "recipe__name", "tag__name"
+            )
+        case "ingredient":
+            return models.Ingredient.objects.order_by("id").values_list(
+                "recipe__name", "product__name", "weight"
+            )
+        case "menu":
+            return models.Menu.objects.order_by("date").values_list("date")
+        case "menu_recipe":
+            return models.MenuRecipes.objects.order_by(
+                "menu__date", "mealtime_order", "id"
+            ).values_list("menu__date", "recipe__name", "mealtime", "count")
+    raise ValueError(f"Unknown kind {kind!r}")
+
+
+class Importer:
+    """Buffers records per kind and writes each full batch in a transaction.
+
+    Before a batch is written, the pending batches of the kinds it depends on
+    are written, so names in it can be resolved to ids.
+    """
+
+    def __init__(self, batch_size: int = 1000) -> None:
+        self.batch_size = batch_size
+        self.counts: collections.Counter[str] = collections.Counter()
+        self._batches: dict[str, list[dict]] = {kind: [] for kind in KINDS}
+        self._recipe_ids: set[int] = set()
+        self._menu_dates: set[dt.date] = set()
+        self._cleared_menu_ids: set[int] = set()
+        self._product_ids: set[int] = set()
+
+    def add(self, kind: str, record: dict) -> None:
+        if kind not in FIELDS:
+            raise ValueError(f"Unknown kind {kind!r}")
+        if missing := [field for field in FIELDS[kind] if field not in record]:
+            raise ValueError(f"{kind} is missing {', '.join(missing)}")
+        batch = self._batches[kind]
+        batch.append(record)
+        if len(batch) >= self.batch_size:
+            self._flush(kind)
+
+    def finish(self) -> None:
+        """Writes what is left and refreshes everything derived from it."""
+        for kind in KINDS:
+            self._flush(kind)
+        # Bulk writes skip the signals that maintain these.
+        with transaction.atomic():
+            search.index_recipes(self._recipe_ids)
+            rollups.refresh(self._recipe_ids)
+            if self._recipe_ids or self._product_ids:
+                cooking.record_changes([cooking.REBUILD])
+        dates = self._menu_dates | set(_menu_dates_using("recipe_id", self._recipe_ids))
+        # show_in_grocery_list decides whether a product is in a grocery list.
+        dates.update(
+            _menu_dates_using("recipe__ingredients__product_id", self._product_ids)
+        )
+        cache.invalidate(dates)
+
+    def _flush(self, kind: str) -> None:
+        if not (batch := self._batches[kind]):
+            return
+        for dependency in KINDS[: KINDS.index(kind)]:
+            self._flush(dependency)
+        self._batches[kind] = []
+        with transaction.atomic():
+            getattr(self, f"_import_{kind}")(batch)
+        self.counts[kind] += len(batch)
+
+    def _import_product(self, batch: list[dict]) -> None:
+        models.Product.objects.bulk_create(
+            [
+                models.Product(
+                    name=record["name"],
+                    name_key=models.name_key(record["name"]),
+                    show_in_grocery_list=_bool(record["show_in_grocery_list"]),
+                )
+                for record in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["show_in_grocery_list"],
+        )
+        self._product_ids.update(
+            _ids(models.Product, "name", [record["name"] for record in batch]).values()
+        )
+
+    def _import_tag(self, batch: list[dict]) -> None:
+        models.Tag.objects.bulk_create(
+            [models.Tag(name=record["name"]) for record in batch],
+            ignore_conflicts=True,
+        )
+
+    def _import_recipe(self, batch: list[dict]) -> None:
+        models.Recipe.objects.bulk_create(
+            [
+                models.Recipe(
+                    name=record["name"],
+                    name_key=models.name_key(record["name"]),
+                    num_portions=int(record["num_portions"]),
+                    how_to=record["how_to"] or None,
+                )
+                for record in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["num_portions", "how_to"],
+        )
+        self._recipe_ids.update(
+            _ids(models.Recipe, "name", [record["name"] for record in batch]).values()
+        )
+
+    def _import_recipe_tag(self, batch: list[dict]) -> None:
+        recipe_ids = _ids(models.Recipe, "name", [record["recipe"] for record in batch])
+        tag_ids = _ids(models.Tag, "name", [record["tag"] for record in batch])
+        Through = models.Recipe.tags.through
+        Through.objects.bulk_create(
+            [
+                Through(
+                    recipe_id=_get(recipe_ids, record["recipe"], "recipe"),
+                    tag_id=_get(tag_ids, record["tag"], "tag"),
+                )
+                for record in batch
+            ],
+            ignore_conflicts=True,
+        )
+        self._recipe_ids.update(recipe_ids.values())
+
+    def _import_ingredient(self, batch: list[dict]) -> None:
+        recipe_ids = _ids(models.Recipe, "name", [record["recipe"] for record in batch])
+        product_ids = _ids(
+            models.Product, "name", [record["product"] for record in batch]
+        )
+        models.Ingredient.objects.bulk_create(
+            [
+                models.Ingredient(
+                    recipe_id=_get(recipe_ids, record["recipe"], "recipe"),
+                    product_id=_get(product_ids, record["product"], "product"),
+                    weight=int(record["weight"]),
+                )
+                for record in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["recipe", "product"],
+            update_fields=["weight"],
+        )
+        self._recipe_ids.update(recipe_ids.values())
+
+    def _import_menu(self, batch: list[dict]) -> None:
+        dates = [_date(record["date"]) for record in batch]
+        models.Menu.objects.bulk_create(
+            [models.Menu(date=date) for date in dates], ignore_conflicts=True
+        )
+        self._menu_dates.update(dates)
+
+    def _import_menu_recipe(self, batch: list[dict]) -> None:
+        menu_ids = _ids(
+            models.Menu, "date", [_date(record["date"]) for record in batch]
+        )
+        recipe_ids = _ids(models.Recipe, "name", [record["recipe"] for record in batch])
+        menu_recipes = []
+        for record in batch:
+            mealtime = models.MenuRecipes.Mealtime(record["mealtime"])
+            menu_recipes.append(
+                models.MenuRecipes(
+                    menu_id=_get(menu_ids, _date(record["date"]), "menu"),
+                    recipe_id=_get(recipe_ids, record["recipe"], "recipe"),
+                    mealtime=mealtime,
+                    mealtime_order=mealtime.order,
+                    count=float(record["count"]),
+                )
+            )
+        # The stream replaces a menu's recipes, so imports can be repeated.
+        # The caches are invalidated in finish(), so skip the per-row signals.
+        if new_menu_ids := set(menu_ids.values()) - self._cleared_menu_ids:
+            table = connection.ops.quote_name(models.MenuRecipes._meta.db_table)
+            placeholders = ", ".join(["%s"] * len(new_menu_ids))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE menu_id IN ({placeholders})",
+                    list(new_menu_ids),
+                )
+            self._cleared_menu_ids |= new_menu_ids
+        models.MenuRecipes.objects.bulk_create(menu_recipes)
+        self._menu_dates.update(menu_ids)
+
+
+def _ids(model, field: str, keys: list) -> dict:
+    return dict(
+        model.objects.filter(**{f"{field}__in": set(keys)}).values_list(field, "id")
+    )
+
+
+def _get(ids: dict, key, kind: str) -> int:
+    try:
+        return ids[key]
+    except KeyError:
+        raise ValueError(f"Unknown {kind} {key!r}") from None
+
+
+def _bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "да")
+
+
+def _date(value) -> dt.date:
+    return value if isinstance(value, dt.date) else dt.date.fromisoformat(value)
+
+
+def _menu_dates_using(lookup: str, ids: Iterable[int]) -> Iterator[dt.date]:
+    """Dates of the menus whose recipes match `menu_recipes__<lookup>__in=ids`."""
+    ids = list(ids)
+    for start in range(0, len(ids), search.CHUNK_SIZE):
+        yield from (
+            models.Menu.objects.filter(
+                **{
+                    f"menu_recipes__{lookup}__in": ids[
+                        start : start + search.CHUNK_SIZE
+                    ]
+                }
+            )
+            .values_list("date", flat=True)
+            .distinct()
+        )
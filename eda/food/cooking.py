@@ -0,0 +1,232 @@
+"""In-memory "what can I cook" index.
+
+Every recipe keeps a bitset of its products, every product a posting set of
+the recipes using it. Matching a product list unions a few posting sets and
+counts the covered ingredients with `int.bit_count()`, without touching
+`Ingredient` rows.
+
+Processes keep their own copy and catch up through `IngredientChange`, which
+signals append to in the same transaction as the change: only the recipes
+listed there are reloaded. Products hidden from the grocery list (salt,
+water) are assumed to be on hand.
+"""
+
+import contextlib
+import heapq
+import threading
+import typing
+
+from django.db import connection
+from django.db.models import Max, Min
+
+from eda.food import models
+
+# Replaying more changes than this at once is slower than a rebuild.
+MAX_REPLAYED_CHANGES = 1000
+# Changes older than this many rows are deleted on every rebuild and sync.
+KEPT_CHANGES = 10_000
+MISSING_SHOWN = 3
+# Recorded as the recipe of a change to make every process rebuild.
+REBUILD = 0
+
+
+class CookMatch(typing.NamedTuple):
+    name: str
+    matched: int
+    total: int
+    missing: list[str]
+
+
+class CookIndex:
+    def __init__(self) -> None:
+        self._product_bits: dict[int, int] = {}
+        self._bit_products: list[int] = []
+        self._product_names: dict[int, str] = {}
+        self._pantry = 0
+        self._recipe_products: dict[int, int] = {}
+        self._postings: dict[int, set[int]] = {}
+        self._last_change_id = 0
+
+    def rebuild(self) -> None:
+        with _read_snapshot():
+            last_change_id = (
+                models.IngredientChange.objects.aggregate(Max("id"))["id__max"] or 0
+            )
+            self._load_products()
+            self._recipe_products, self._postings = {}, {}
+            self._add_ingredients(
+                models.Ingredient.objects.values_list("recipe_id", "product_id")
+            )
+        self._last_change_id = last_change_id
+        self._prune()
+
+    def sync(self) -> None:
+        """Applies the changes made since the last sync or rebuild."""
+        changes = models.IngredientChange.objects.filter(
+            id__gt=self._last_change_id
+        ).order_by("id")
+        rows = list(changes.values_list("id", "recipe_id")[: MAX_REPLAYED_CHANGES + 1])
+        if not rows:
+            return
+        first_kept = models.IngredientChange.objects.aggregate(Min("id"))["id__min"]
+        if (
+            len(rows) > MAX_REPLAYED_CHANGES
+            # The changes we missed were pruned.
+            or first_kept > self._last_change_id + 1
+            or any(recipe_id == REBUILD for _, recipe_id in rows)
+        ):
+            self.rebuild()
+            return
+
+        recipe_ids = {recipe_id for _, recipe_id in rows if recipe_id is not None}
+        with _read_snapshot():
+            if len(recipe_ids) < len(rows):
+                self._load_products()
+            for recipe_id in recipe_ids:
+                self._remove_recipe(recipe_id)
+            self._add_ingredients(
+                models.Ingredient.objects.filter(recipe_id__in=recipe_ids).values_list(
+                    "recipe_id", "product_id"
+                )
+            )
+        self._last_change_id = rows[-1][0]
+        self._prune()
+
+    def _prune(self) -> None:
+        # Processes further behind than this rebuild anyway.
+        models.IngredientChange.objects.filter(
+            id__lte=self._last_change_id - KEPT_CHANGES
+        ).delete()
+
+    def match(self, product_ids: set[int], limit: int) -> list[tuple[int, int, int]]:
+        """Recipes using any of the products, best covered first.
+
+        Returns recipe ids with the number of matched and total ingredients.
+        """
+        candidates: set[int] = set()
+        on_hand = self._pantry
+        for product_id in product_ids:
+            candidates |= self._postings.get(product_id, set())
+            on_hand |= self._product_bits.get(product_id, 0)
+
+        matches = []
+        for recipe_id in candidates:
+            products = self._recipe_products[recipe_id]
+            matches.append(
+                (recipe_id, (products & on_hand).bit_count(), products.bit_count())
+            )
+        return heapq.nsmallest(
+            limit, matches, key=lambda match: (-match[1] / match[2], -match[1])
+        )
+
+    def find_products(self, names: list[str]) -> set[int]:
+        """Ids of products whose name contains any of `names`, ignoring case."""
+        needles = [name.casefold().strip() for name in names if name.strip()]
+        return {
+            product_id
+            for product_id, product_name in self._product_names.items()
+            if any(needle in product_name.casefold() for needle in needles)
+        }
+
+    def missing_products(self, recipe_id: int, product_ids: set[int]) -> list[str]:
+        on_hand = self._pantry
+        for product_id in product_ids:
+            on_hand |= self._product_bits.get(product_id, 0)
+        missing = self._recipe_products[recipe_id] & ~on_hand
+        return sorted(
+            self._product_names[product_id]
+            for product_id in self._products(missing)
+            if product_id in self._product_names
+        )
+
+    def _load_products(self) -> None:
+        self._product_names, self._pantry = {}, 0
+        rows = models.Product.objects.values_list("id", "name", "show_in_grocery_list")
+        for product_id, name, show_in_grocery_list in rows:
+            # Keep bit positions stable, recipe bitsets refer to them.
+            if (bit := self._product_bits.get(product_id)) is None:
+                bit = self._product_bits[product_id] = 1 << len(self._bit_products)
+                self._bit_products.append(product_id)
+            self._product_names[product_id] = name
+            if not show_in_grocery_list:
+                self._pantry |= bit
+
+    def _add_ingredients(self, rows: typing.Iterable[tuple[int, int]]) -> None:
+        for recipe_id, product_id in rows:
+            if (bit := self._product_bits.get(product_id)) is None:
+                continue
+            self._recipe_products[recipe_id] = (
+                self._recipe_products.get(recipe_id, 0) | bit
+            )
+            self._postings.setdefault(product_id, set()).add(recipe_id)
+
+    def _remove_recipe(self, recipe_id: int) -> None:
+        for product_id in self._products(self._recipe_products.pop(recipe_id, 0)):
+            self._postings[product_id].discard(recipe_id)
+
+    def _products(self, bits: int) -> typing.Iterator[int]:
+        while bits:
+            lowest = bits & -bits
+            yield self._bit_products[lowest.bit_length() - 1]
+            bits ^= lowest
+
+
+_index: CookIndex | None = None
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _read_snapshot():
+    """A consistent view of the tables that doesn't take the write lock.
+
+    transaction.atomic() begins IMMEDIATE transactions, which would make
+    readers wait for, and block, every writer.
+    """
+    if connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("BEGIN DEFERRED")
+        try:
+            yield
+        finally:
+            cursor.execute("COMMIT")
+
+
+def get_index() -> CookIndex:
+    global _index
+    with _lock:
+        if _index is None:
+            index = CookIndex()
+            index.rebuild()
+            _index = index
+        else:
+            _index.sync()
+        return _index
+
+
+def what_can_i_cook(names: list[str], limit: int) -> list[CookMatch]:
+    index = get_index()
+    product_ids = index.find_products(names)
+    matches = index.match(product_ids, limit)
+    recipe_names = dict(
+        models.Recipe.objects.filter(
+            id__in=[recipe_id for recipe_id, _, _ in matches]
+        ).values_list("id", "name")
+    )
+    return [
+        CookMatch(
+            recipe_names[recipe_id],
+            matched,
+            total,
+            index.missing_products(recipe_id, product_ids)[:MISSING_SHOWN],
+        )
+        for recipe_id, matched, total in matches
+        if recipe_id in recipe_names
+    ]
+
+
+def record_changes(recipe_ids: typing.Iterable[int | None]) -> None:
+    models.IngredientChange.objects.bulk_create(
+        models.IngredientChange(recipe_id=recipe_id) for recipe_id in set(recipe_ids)
+    )
@@ -0,0 +1,56 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eda.food import catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams products, tags, recipes and menus as JSON Lines "
+        "or as CSV of a single kind."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "output", nargs="?", default="-", help="File to write, - for stdout."
+        )
+        parser.add_argument("--format", choices=["jsonl", "csv"])
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=catalogue.KINDS,
+            help="Kinds to export, all by default. CSV needs exactly one.",
+        )
+
+    def handle(self, *args, output: str, **options) -> None:
+        format_ = options["format"] or ("csv" if output.endswith(".csv") else "jsonl")
+        kinds = options["kind"] or catalogue.KINDS
+        if format_ == "csv" and len(kinds) != 1:
+            raise CommandError("CSV export needs exactly one --kind")
+
+        file = (
+            sys.stdout
+            if output == "-"
+            else open(output, "w", encoding="utf-8", newline="")
+        )
+        try:
+            if format_ == "csv":
+                writer = csv.DictWriter(file, catalogue.FIELDS[kinds[0]])
+                writer.writeheader()
+                writer.writerows(catalogue.export(kinds[0]))
+                return
+            # Kinds are written in dependency order, so the file imports as is.
+            for kind in sorted(kinds, key=catalogue.KINDS.index):
+                for record in catalogue.export(kind):
+                    file.write(
+                        json.dumps(
+                            {"type": kind, **record}, ensure_ascii=False, default=str
+                        )
+                        + "\n"
+                    )
+        finally:
+            if file is not sys.stdout:
+                file.close()
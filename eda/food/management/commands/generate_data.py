@@ -0,0 +1,173 @@
+import datetime as dt
+import itertools
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from eda.food import cache, cooking, models, rollups, search
+
+ADJECTIVES = [
+    "домашний",
+    "запечённый",
+    "лёгкий",
+    "острый",
+    "пряный",
+    "сливочный",
+    "томлёный",
+    "хрустящий",
+]
+DISHES = ["запеканка", "каша", "омлет", "рагу", "салат", "суп", "пирог", "паста"]
+PRODUCTS = ["мука", "молоко", "рис", "курица", "морковь", "сыр", "яйцо", "томат"]
+
+
+class Command(BaseCommand):
+    help = "Fills the database with synthetic recipes, products and menus."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--products", type=int, default=5_000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--recipes", type=int, default=20_000)
+        parser.add_argument("--ingredients-per-recipe", type=int, default=8)
+        parser.add_argument("--days", type=int, default=3 * 365)
+        parser.add_argument("--recipes-per-mealtime", type=int, default=2)
+        parser.add_argument("--batch-size", type=int, default=2_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete existing food data first."
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            stale_dates = list(models.Menu.objects.values_list("date", flat=True))
+            if options["clear"]:
+                self._clear()
+            elif models.Recipe.objects.exists() or models.Menu.objects.exists():
+                raise CommandError("The database is not empty, use --clear.")
+
+            tags = self._create(
+                (
+                    models.Tag(name=f"{name} {i}")
+                    for i, name in zip(range(options["tags"]), itertools.cycle(DISHES))
+                ),
+                key="name",
+            )
+            products = self._create(
+                (
+                    models.Product(
+                        name=f"{name} {i}",
+                        show_in_grocery_list=self.random.random() > 0.1,
+                    )
+                    for i, name in zip(
+                        range(options["products"]), itertools.cycle(PRODUCTS)
+                    )
+                ),
+                key="name",
+            )
+            recipes = self._create(
+                (
+                    models.Recipe(
+                        name=(
+                            f"{self.random.choice(ADJECTIVES).capitalize()} "
+                            f"{self.random.choice(DISHES)} {i}"
+                        ),
+                        num_portions=self.random.randint(1, 6),
+                        how_to="Смешать, довести до готовности и подать.",
+                    )
+                    for i in range(options["recipes"])
+                ),
+                key="name",
+            )
+            self._create_ingredients(recipes, products, options)
+            self._create_recipe_tags(recipes, tags)
+            dates = self._create_menus(recipes, options)
+            # bulk_create skips the signals that keep the index in sync.
+            search.rebuild()
+            rollups.rebuild()
+            cooking.record_changes([cooking.REBUILD])
+
+        cache.invalidate([*stale_dates, *dates])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(products)} products, {len(recipes)} recipes "
+                f"and {len(dates)} menus"
+            )
+        )
+
+    @staticmethod
+    def _clear() -> None:
+        # Plain DELETEs, a cascading delete would fire signals for every row.
+        with connection.cursor() as cursor:
+            for model in (
+                models.RecipeRollup,
+                models.MenuRecipes,
+                models.Menu,
+                models.Ingredient,
+                models.Recipe.tags.through,
+                models.Recipe,
+                models.Product,
+                models.Tag,
+            ):
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(f"DELETE FROM {table}")
+
+    def _create(self, objs, key: str | None = None) -> list:
+        """Bulk creates the objects, giving them ids looked up by `key`."""
+        if not (objs := list(objs)):
+            return []
+        # bulk_create skips save(), which fills the search key.
+        for obj in objs:
+            if isinstance(obj, models.NameKeyMixin):
+                obj.name_key = models.name_key(obj.name)
+        model = type(objs[0])
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        if key:
+            # SQLite before 3.35 doesn't return the ids of bulk inserted rows.
+            ids = dict(model.objects.values_list(key, "id"))
+            for obj in objs:
+                obj.pk = ids[getattr(obj, key)]
+        return objs
+
+    def _create_ingredients(self, recipes, products, options) -> None:
+        count = min(options["ingredients_per_recipe"], len(products))
+        self._create(
+            models.Ingredient(
+                recipe=recipe,
+                product=product,
+                weight=self.random.randint(5, 1000),
+            )
+            for recipe in recipes
+            for product in self.random.sample(products, count)
+        )
+
+    def _create_recipe_tags(self, recipes, tags) -> None:
+        Through = models.Recipe.tags.through
+        Through.objects.bulk_create(
+            (
+                Through(recipe=recipe, tag=tag)
+                for recipe in recipes
+                for tag in self.random.sample(tags, min(2, len(tags)))
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def _create_menus(self, recipes, options) -> list[dt.date]:
+        last_date = dt.date.today() + dt.timedelta(days=7)
+        dates = [last_date - dt.timedelta(days=days) for days in range(options["days"])]
+        menus = self._create((models.Menu(date=date) for date in dates), key="date")
+        self._create(
+            models.MenuRecipes(
+                menu=menu,
+                recipe=recipe,
+                mealtime=mealtime,
+                mealtime_order=mealtime.order,
+                count=self.random.choice([0.5, 1.0, 1.0, 2.0]),
+            )
+            for menu in menus
+            for mealtime in models.MenuRecipes.Mealtime
+            for recipe in self.random.sample(recipes, options["recipes_per_mealtime"])
+        )
+        return dates
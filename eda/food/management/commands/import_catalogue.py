@@ -0,0 +1,75 @@
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterator
+from typing import TextIO
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eda.food import catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads products, tags, recipes and menus from JSON Lines "
+        "or from CSV of a single kind in batches."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("input", help="File to read, - for stdin.")
+        parser.add_argument("--format", choices=["jsonl", "csv"])
+        parser.add_argument(
+            "--kind", choices=catalogue.KINDS, help="Kind of the CSV rows."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, input: str, **options) -> None:
+        format_ = options["format"] or ("csv" if input.endswith(".csv") else "jsonl")
+        if format_ == "csv" and not options["kind"]:
+            raise CommandError("CSV import needs --kind")
+
+        started = time.perf_counter()
+        importer = catalogue.Importer(options["batch_size"])
+        file = sys.stdin if input == "-" else open(input, encoding="utf-8", newline="")
+        try:
+            records = (
+                self._csv_records(file, options["kind"])
+                if format_ == "csv"
+                else self._jsonl_records(file)
+            )
+            for number, (kind, record) in enumerate(records, start=1):
+                try:
+                    importer.add(kind, record)
+                except (ValueError, KeyError) as e:
+                    raise CommandError(f"Record {number}: {e}") from e
+            try:
+                importer.finish()
+            except (ValueError, KeyError) as e:
+                raise CommandError(f"Last batch: {e}") from e
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        counts = ", ".join(
+            f"{importer.counts[kind]} {kind}"
+            for kind in catalogue.KINDS
+            if importer.counts[kind]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts or 'nothing'} in {time.perf_counter() - started:.1f} s"
+            )
+        )
+
+    @staticmethod
+    def _jsonl_records(file: TextIO) -> Iterator[tuple[str, dict]]:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record.pop("type", None), record
+
+    @staticmethod
+    def _csv_records(file: TextIO, kind: str) -> Iterator[tuple[str, dict]]:
+        for record in csv.DictReader(file):
+            yield kind, record
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from eda.food import rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-recipe rollups from ingredients and tags."
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            count = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollups"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from eda.food import search
+
+
+class Command(BaseCommand):
+    help = "Recreates the full-text recipe search index."
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} recipes"))
@@ -0,0 +1,42 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+from telegram import Update
+
+from eda.core import settings
+from eda.telegrambot import utils
+
+
+class Command(BaseCommand):
+    help = "Points the bot's webhook at TELEGRAM_WEBHOOK_URL or removes it."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--delete", action="store_true", help="Remove the webhook to poll again."
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["delete"]:
+            asyncio.run(self._delete_webhook())
+            self.stdout.write(self.style.SUCCESS("Webhook removed"))
+            return
+        if not settings.TELEGRAM_WEBHOOK_URL or not settings.TELEGRAM_WEBHOOK_SECRET:
+            raise CommandError(
+                "Set TELEGRAM_WEBHOOK_URL and TELEGRAM_WEBHOOK_SECRET first"
+            )
+        asyncio.run(self._set_webhook())
+        self.stdout.write(
+            self.style.SUCCESS(f"Webhook set to {settings.TELEGRAM_WEBHOOK_URL}")
+        )
+
+    async def _set_webhook(self) -> None:
+        async with utils.get_telegram().bot as bot:
+            await bot.set_webhook(
+                settings.TELEGRAM_WEBHOOK_URL,
+                secret_token=settings.TELEGRAM_WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES,
+            )
+
+    async def _delete_webhook(self) -> None:
+        async with utils.get_telegram().bot as bot:
+            await bot.delete_webhook()
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0004_tag_alter_menurecipes_options_recipe_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Subscriber",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("chat_id", models.BigIntegerField(unique=True, verbose_name="чат")),
+                (
+                    "name",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="название"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, verbose_name="активен"),
+                ),
+            ],
+            options={
+                "verbose_name": "подписчик",
+                "verbose_name_plural": "подписчики",
+                "db_table": "subscribers",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="num_portions",
+            field=models.PositiveSmallIntegerField(
+                default=1, verbose_name="кол-во порций"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="tags",
+            field=models.ManyToManyField(blank=True, to="food.tag"),
+        ),
+    ]
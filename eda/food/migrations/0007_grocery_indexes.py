@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0006_job"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="subscriber",
+            options={
+                "ordering": ["chat_id"],
+                "verbose_name": "подписчик",
+                "verbose_name_plural": "подписчики",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["recipe", "product", "weight"], name="ingredients_grocery_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menurecipes",
+            index=models.Index(
+                fields=["menu", "mealtime"], name="menu_recipes_mealtime_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menurecipes",
+            index=models.Index(
+                fields=["menu", "recipe", "count"], name="menu_recipes_grocery_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscriber",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["chat_id"],
+                name="subscribers_active_idx",
+            ),
+        ),
+    ]
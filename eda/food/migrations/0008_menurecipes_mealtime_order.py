@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+MEALTIME_ORDER = ["breakfast", "lunch", "dinner"]
+
+
+def backfill_mealtime_order(apps, schema_editor):
+    MenuRecipes = apps.get_model("food", "MenuRecipes")
+    for order, mealtime in enumerate(MEALTIME_ORDER):
+        MenuRecipes.objects.filter(mealtime=mealtime).update(mealtime_order=order)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0007_grocery_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="menurecipes",
+            options={
+                "ordering": ["mealtime_order", "id"],
+                "verbose_name": "блюдо",
+                "verbose_name_plural": "блюда",
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="menurecipes",
+            name="menu_recipes_mealtime_idx",
+        ),
+        migrations.AddField(
+            model_name="menurecipes",
+            name="mealtime_order",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_mealtime_order, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="menurecipes",
+            index=models.Index(
+                fields=["menu", "mealtime_order"], name="menu_recipes_mealtime_idx"
+            ),
+        ),
+    ]
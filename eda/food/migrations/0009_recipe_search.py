@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0008_menurecipes_mealtime_order"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE VIRTUAL TABLE recipes_search USING fts5(
+                name, how_to, products, tags,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """,
+            "DROP TABLE recipes_search",
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO recipes_search (rowid, name, how_to, products, tags)
+            SELECT
+                recipes.id,
+                recipes.name,
+                COALESCE(recipes.how_to, ''),
+                COALESCE((
+                    SELECT GROUP_CONCAT(products.name, ' ')
+                    FROM ingredients
+                    JOIN products ON products.id = ingredients.product_id
+                    WHERE ingredients.recipe_id = recipes.id
+                ), ''),
+                COALESCE((
+                    SELECT GROUP_CONCAT(tags.name, ' ')
+                    FROM recipes_tags JOIN tags ON tags.id = recipes_tags.tag_id
+                    WHERE recipes_tags.recipe_id = recipes.id
+                ), '')
+            FROM recipes
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0009_recipe_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngredientChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("recipe_id", models.BigIntegerField(null=True)),
+            ],
+            options={
+                "db_table": "ingredient_changes",
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_rollups(apps, schema_editor):
+    Recipe = apps.get_model("food", "Recipe")
+    RecipeRollup = apps.get_model("food", "RecipeRollup")
+    tag_names = {}
+    tags = Recipe.tags.through.objects.order_by("tag__name").values_list(
+        "recipe_id", "tag__name"
+    )
+    for recipe_id, name in tags:
+        tag_names.setdefault(recipe_id, []).append(name)
+    recipes = (
+        Recipe.objects.order_by()
+        .values_list("id", "num_portions")
+        .annotate(
+            ingredient_count=Count("ingredients"),
+            total_weight=Coalesce(Sum("ingredients__weight"), 0),
+        )
+    )
+    RecipeRollup.objects.bulk_create(
+        (
+            RecipeRollup(
+                recipe_id=recipe_id,
+                ingredient_count=ingredient_count,
+                total_weight=total_weight,
+                weight_per_portion=total_weight / (num_portions or 1),
+                tag_names=", ".join(tag_names.get(recipe_id, [])),
+            )
+            for recipe_id, num_portions, ingredient_count, total_weight in recipes
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0010_ingredientchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeRollup",
+            fields=[
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rollup",
+                        serialize=False,
+                        to="food.recipe",
+                        verbose_name="блюдо",
+                    ),
+                ),
+                (
+                    "ingredient_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="кол-во ингредиентов"
+                    ),
+                ),
+                (
+                    "total_weight",
+                    models.PositiveIntegerField(default=0, verbose_name="общий вес"),
+                ),
+                (
+                    "weight_per_portion",
+                    models.FloatField(default=0, verbose_name="вес порции"),
+                ),
+                ("tag_names", models.TextField(blank=True, verbose_name="теги")),
+            ],
+            options={
+                "verbose_name": "сводка по блюду",
+                "verbose_name_plural": "сводки по блюдам",
+                "db_table": "recipe_rollups",
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
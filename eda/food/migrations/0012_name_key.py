@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:29
+
+from django.db import migrations, models
+
+
+def fill_name_keys(apps, schema_editor):
+    for model_name in ("Product", "Recipe"):
+        model = apps.get_model("food", model_name)
+        objects = list(model.objects.only("id", "name"))
+        for obj in objects:
+            obj.name_key = obj.name.casefold()
+        model.objects.bulk_update(objects, ["name_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("food", "0011_reciperollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="name_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="name_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+    ]
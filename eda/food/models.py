@@ -4,6 +4,24 @@ from django.utils import formats
 from eda.core.models import BaseModel
 
 
+def name_key(name: str) -> str:
+    """Case-insensitive key for prefix searches, SQLite's LOWER() is ASCII-only."""
+    return name.casefold()
+
+
+class NameKeyMixin(models.Model):
+    name_key = models.CharField(max_length=255, editable=False, db_index=True)
+
+    def save(self, *args, **kwargs) -> None:
+        self.name_key = name_key(self.name)
+        if (update_fields := kwargs.get("update_fields")) and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "name_key"}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
+
+
 class Tag(BaseModel):
     name = models.CharField("тег", max_length=50, unique=True)
 
@@ -14,7 +32,7 @@ class Tag(BaseModel):
         verbose_name_plural = "теги"
 
 
-class Recipe(BaseModel):
+class Recipe(NameKeyMixin, BaseModel):
     name = models.CharField("название", max_length=255, unique=True)
     num_portions = models.PositiveSmallIntegerField("кол-во порций", default=1)
     how_to = models.TextField("инструкция", max_length=4096, null=True, blank=True)
@@ -27,7 +45,7 @@ class Recipe(BaseModel):
         verbose_name_plural = "блюда"
 
 
-class Product(BaseModel):
+class Product(NameKeyMixin, BaseModel):
     name = models.CharField("название", max_length=255, unique=True)
     show_in_grocery_list = models.BooleanField(
         "показывать в списке покупок", default=True
@@ -54,12 +72,38 @@ class Ingredient(BaseModel):
 
     class Meta:
         db_table = "ingredients"
+        indexes = [
+            # Covers the recipe -> product join of the grocery list.
+            models.Index(
+                fields=["recipe", "product", "weight"], name="ingredients_grocery_idx"
+            ),
+        ]
         ordering = ["-weight", "product__name"]
         unique_together = ["recipe", "product"]
         verbose_name = "ингредиент"
         verbose_name_plural = "ингредиенты"
 
 
+class RecipeRollup(BaseModel):
+    # Per-recipe aggregates kept up to date by signals, see eda.food.rollups.
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rollup",
+        verbose_name="блюдо",
+    )
+    ingredient_count = models.PositiveIntegerField("кол-во ингредиентов", default=0)
+    total_weight = models.PositiveIntegerField("общий вес", default=0)
+    weight_per_portion = models.FloatField("вес порции", default=0)
+    tag_names = models.TextField("теги", blank=True)
+
+    class Meta:
+        db_table = "recipe_rollups"
+        verbose_name = "сводка по блюду"
+        verbose_name_plural = "сводки по блюдам"
+
+
 class Menu(BaseModel):
     date = models.DateField("дата", unique=True)
 
@@ -79,6 +123,10 @@ class MenuRecipes(BaseModel):
         LUNCH = "lunch", "обед"
         DINNER = "dinner", "ужин"
 
+        @property
+        def order(self) -> int:
+            return list(type(self)).index(self)
+
     menu = models.ForeignKey(
         Menu,
         on_delete=models.CASCADE,
@@ -92,10 +140,69 @@ class MenuRecipes(BaseModel):
         verbose_name="блюдо",
     )
     mealtime = models.CharField(max_length=16, choices=Mealtime)
+    mealtime_order = models.PositiveSmallIntegerField(editable=False)
     count = models.FloatField("количество", default=1.0)
 
+    def save(self, *args, **kwargs) -> None:
+        self.mealtime_order = self.Mealtime(self.mealtime).order
+        if (
+            update_fields := kwargs.get("update_fields")
+        ) and "mealtime" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "mealtime_order"}
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = "menu_recipes"
-        ordering = ["recipe__name"]
+        indexes = [
+            models.Index(
+                fields=["menu", "mealtime_order"], name="menu_recipes_mealtime_idx"
+            ),
+            # Covers the menu -> recipe join of the grocery list.
+            models.Index(
+                fields=["menu", "recipe", "count"], name="menu_recipes_grocery_idx"
+            ),
+        ]
+        ordering = ["mealtime_order", "id"]
         verbose_name = "блюдо"
         verbose_name_plural = "блюда"
+
+
+class Subscriber(BaseModel):
+    chat_id = models.BigIntegerField("чат", unique=True)
+    name = models.CharField("название", max_length=255, blank=True)
+    is_active = models.BooleanField("активен", default=True)
+
+    class Meta:
+        db_table = "subscribers"
+        indexes = [
+            models.Index(
+                fields=["chat_id"],
+                condition=models.Q(is_active=True),
+                name="subscribers_active_idx",
+            ),
+        ]
+        ordering = ["chat_id"]
+        verbose_name = "подписчик"
+        verbose_name_plural = "подписчики"
+
+
+class Job(BaseModel):
+    name = models.CharField("название", max_length=255, unique=True)
+    last_run_at = models.DateTimeField("последний запуск", null=True, blank=True)
+    locked_until = models.DateTimeField("занято до", null=True, blank=True)
+
+    class Meta:
+        db_table = "jobs"
+        ordering = ["name"]
+        verbose_name = "задача"
+        verbose_name_plural = "задачи"
+
+
+class IngredientChange(BaseModel):
+    # Change feed for in-process indexes: every process replays the rows it
+    # has not seen yet. An empty recipe means products changed, recipe 0 that
+    # everything did.
+    recipe_id = models.BigIntegerField(null=True)
+
+    class Meta:
+        db_table = "ingredient_changes"
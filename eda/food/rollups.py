@@ -0,0 +1,62 @@
+from collections.abc import Iterable
+
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from eda.food import models
+
+CHUNK_SIZE = 500
+
+
+def refresh(recipe_ids: Iterable[int]) -> None:
+    """Recomputes the rollups of the given recipes."""
+    recipe_ids = list(set(recipe_ids))
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        _refresh_chunk(recipe_ids[start : start + CHUNK_SIZE])
+
+
+def rebuild() -> int:
+    models.RecipeRollup.objects.all().delete()
+    refresh(models.Recipe.objects.values_list("id", flat=True))
+    return models.RecipeRollup.objects.count()
+
+
+def _refresh_chunk(recipe_ids: list[int]) -> None:
+    tag_names: dict[int, list[str]] = {}
+    tags = (
+        models.Recipe.tags.through.objects.filter(recipe_id__in=recipe_ids)
+        .order_by("tag__name")
+        .values_list("recipe_id", "tag__name")
+    )
+    for recipe_id, name in tags:
+        tag_names.setdefault(recipe_id, []).append(name)
+
+    recipes = (
+        models.Recipe.objects.filter(id__in=recipe_ids)
+        .order_by()
+        .values_list("id", "num_portions")
+        .annotate(
+            ingredient_count=Count("ingredients"),
+            total_weight=Coalesce(Sum("ingredients__weight"), 0),
+        )
+    )
+    models.RecipeRollup.objects.bulk_create(
+        [
+            models.RecipeRollup(
+                recipe_id=recipe_id,
+                ingredient_count=ingredient_count,
+                total_weight=total_weight,
+                weight_per_portion=total_weight / (num_portions or 1),
+                tag_names=", ".join(tag_names.get(recipe_id, [])),
+            )
+            for recipe_id, num_portions, ingredient_count, total_weight in recipes
+        ],
+        update_conflicts=True,
+        unique_fields=["recipe"],
+        update_fields=[
+            "ingredient_count",
+            "total_weight",
+            "weight_per_portion",
+            "tag_names",
+        ],
+    )
@@ -0,0 +1,113 @@
+import asyncio
+import dataclasses
+import datetime as dt
+import logging
+import zoneinfo
+from collections.abc import Awaitable, Callable
+
+from django.db.models import Q
+from django.utils import timezone
+
+from eda.core import settings
+from eda.food import models
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class DailyJob:
+    name: str
+    at: dt.time
+    handle: Callable[[], Awaitable[None]]
+    tzinfo: dt.tzinfo = zoneinfo.ZoneInfo(settings.TIME_ZONE)
+
+    def last_due(self, now: dt.datetime) -> dt.datetime:
+        local_now = now.astimezone(self.tzinfo)
+        due = dt.datetime.combine(local_now.date(), self.at, tzinfo=self.tzinfo)
+        if due > local_now:
+            due -= dt.timedelta(days=1)
+        return due
+
+    def next_due(self, now: dt.datetime) -> dt.datetime:
+        return self.last_due(now) + dt.timedelta(days=1)
+
+
+class Scheduler:
+    """Runs jobs at their due time and catches up on runs missed while down.
+
+    The scheduled time of the last successful run is stored in `models.Job`.
+    A run is claimed with a lease before it starts, so overlapping beat
+    replicas never run it twice. A failed run is retried when its lease
+    expires, as long as it is still within the grace period.
+    """
+
+    def __init__(
+        self,
+        jobs: list[DailyJob],
+        *,
+        grace_period: dt.timedelta = dt.timedelta(seconds=settings.BEAT_GRACE_PERIOD),
+        lease: dt.timedelta = dt.timedelta(seconds=settings.BEAT_LEASE),
+    ) -> None:
+        self.jobs = jobs
+        self.grace_period = grace_period
+        self.lease = lease
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await _create_jobs([job.name for job in self.jobs])
+        while not stop.is_set():
+            wakeups = [await self._run_pending(job) for job in self.jobs]
+            timeout = (min(wakeups) - timezone.now()).total_seconds()
+            logger.debug("Sleeping for %.0f seconds", timeout)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(timeout, 0))
+            except TimeoutError:
+                pass
+
+    async def _run_pending(self, job: DailyJob) -> dt.datetime:
+        """Runs the job if it is due and returns when to check it again."""
+        now = timezone.now()
+        due = job.last_due(now)
+        if now - due > self.grace_period:
+            return job.next_due(now)
+        if not await _claim_job(job.name, due, now, now + self.lease):
+            if await _is_job_done(job.name, due):
+                return job.next_due(now)
+            # Another replica holds the lease, check again when it expires.
+            return now + self.lease
+
+        logger.info("Running %s due at %s", job.name, due)
+        try:
+            await job.handle()
+        except Exception:
+            logger.exception("%s failed", job.name)
+            return now + self.lease
+        await _complete_job(job.name, due)
+        return job.next_due(now)
+
+
+async def _create_jobs(names: list[str]) -> None:
+    for name in names:
+        await models.Job.objects.aget_or_create(name=name)
+
+
+async def _claim_job(
+    name: str, due: dt.datetime, now: dt.datetime, locked_until: dt.datetime
+) -> bool:
+    # A single conditional UPDATE, so only one replica can win the claim.
+    claimed = await (
+        models.Job.objects.filter(name=name)
+        .filter(Q(last_run_at__isnull=True) | Q(last_run_at__lt=due))
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+        .aupdate(locked_until=locked_until)
+    )
+    return claimed == 1
+
+
+async def _is_job_done(name: str, due: dt.datetime) -> bool:
+    return await models.Job.objects.filter(name=name, last_run_at__gte=due).aexists()
+
+
+async def _complete_job(name: str, due: dt.datetime) -> None:
+    await models.Job.objects.filter(name=name).aupdate(
+        last_run_at=due, locked_until=None
+    )
@@ -0,0 +1,87 @@
+"""Full-text recipe search over the `recipes_search` FTS5 table.
+
+Each row mirrors one recipe (rowid = recipe id) with its name, instructions,
+product names and tags. Signals keep it in sync, `manage.py
+rebuild_search_index` recreates it from scratch.
+"""
+
+import re
+from collections.abc import Iterable
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+TABLE = "recipes_search"
+CHUNK_SIZE = 500
+
+# bm25() weights for name, how_to, products and tags.
+_RANK = f"bm25({TABLE}, 10.0, 1.0, 4.0, 4.0)"
+
+_INDEX_SQL = f"""
+    INSERT INTO {TABLE} (rowid, name, how_to, products, tags)
+    SELECT
+        recipes.id,
+        recipes.name,
+        COALESCE(recipes.how_to, ''),
+        COALESCE((
+            SELECT GROUP_CONCAT(products.name, ' ')
+            FROM ingredients JOIN products ON products.id = ingredients.product_id
+            WHERE ingredients.recipe_id = recipes.id
+        ), ''),
+        COALESCE((
+            SELECT GROUP_CONCAT(tags.name, ' ')
+            FROM recipes_tags JOIN tags ON tags.id = recipes_tags.tag_id
+            WHERE recipes_tags.recipe_id = recipes.id
+        ), '')
+    FROM recipes
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def match_expression(query: str) -> str:
+    """Turns user input into an FTS5 query matching all words by prefix."""
+    return " ".join(f'"{word}"*' for word in _WORD.findall(query.casefold()))
+
+
+def index_recipes(recipe_ids: Iterable[int]) -> None:
+    recipe_ids = list(set(recipe_ids))
+    with connection.cursor() as cursor:
+        for start in range(0, len(recipe_ids), CHUNK_SIZE):
+            chunk = recipe_ids[start : start + CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", chunk
+            )
+            cursor.execute(f"{_INDEX_SQL} WHERE recipes.id IN ({placeholders})", chunk)
+
+
+def rebuild() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(_INDEX_SQL)
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def matching_ids(query: str) -> RawSQL:
+    """Subquery of recipe ids for `Recipe.objects.filter(id__in=...)`."""
+    return RawSQL(
+        f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s",
+        [match_expression(query) or '""'],
+    )
+
+
+def ranked_recipes(query: str, limit: int) -> list[tuple[int, str]]:
+    """Ids and names of the best matching recipes, best first."""
+    if not (expression := match_expression(query)):
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT recipes.id, recipes.name FROM {TABLE}"
+            f" JOIN recipes ON recipes.id = {TABLE}.rowid"
+            f" WHERE {TABLE} MATCH %s ORDER BY {_RANK} LIMIT %s",
+            [expression, limit],
+        )
+        return cursor.fetchall()
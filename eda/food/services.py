@@ -1,53 +1,304 @@
 import collections
 import datetime as dt
+import functools
+import typing
+from collections.abc import AsyncIterator, Iterable
 
 from asgiref.sync import sync_to_async
-from django.db.models import Case, IntegerField, Prefetch, When
-
-from eda.food import models
-
-
-@sync_to_async(thread_sensitive=False)
-def get_menu_recipes_at(menu_date: dt.date) -> collections.defaultdict[str, list[str]]:
-    menu_recipes = collections.defaultdict(list)
-    menu = (
-        models.Menu.objects.filter(date=menu_date)
-        .prefetch_related(
-            Prefetch(
-                "menu_recipes",
-                queryset=models.MenuRecipes.objects.annotate(
-                    ordering=Case(
-                        When(mealtime="breakfast", then=0),
-                        When(mealtime="lunch", then=1),
-                        When(mealtime="dinner", then=2),
-                        output_field=IntegerField(),
-                    )
-                ).order_by("ordering"),
-            ),
-            "menu_recipes__recipe",
-        )
-        .get()
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Prefetch, QuerySet, Sum
+
+from eda.core import metrics, settings
+from eda.food import cache, cooking, models, search
+from eda.telegrambot import messages
+
+COOK_LIMIT = 10
+FIND_LIMIT = 10
+GROCERY_CHUNK_SIZE = 500
+MAX_PLANNED_MENUS = 366
+
+
+class GroceryItem(typing.NamedTuple):
+    name: str
+    weight: float
+
+
+class PlannedMenus(typing.NamedTuple):
+    written: list[dt.date]
+    skipped: list[dt.date]
+
+
+@metrics.instrument("service")
+async def get_menu_recipes_at(
+    menu_date: dt.date,
+) -> collections.defaultdict[str, list[str]]:
+    menus, versions = await cache.aget_many("menu", [menu_date])
+    if not menus:
+        menus = await _afetch_menus([menu_date])
+        await cache.aset_many("menu", menus, versions)
+    # A missing menu is cached as None to avoid querying it again.
+    if (menu_recipes := menus[menu_date]) is None:
+        raise models.Menu.DoesNotExist
+    return menu_recipes
+
+
+@metrics.instrument("service")
+async def get_menu_message_at(menu_date: dt.date) -> str:
+    menu_messages, versions = await cache.aget_many("message", [menu_date])
+    if not menu_messages:
+        menus = await _afetch_menus([menu_date])
+        menu_messages = _render_menus(menus)
+        await cache.aset_many("menu", menus, versions)
+        await cache.aset_many("message", menu_messages, versions)
+    if (menu_message := menu_messages[menu_date]) is None:
+        raise models.Menu.DoesNotExist
+    return menu_message
+
+
+@metrics.instrument("service")
+def render_menus(dates: Iterable[dt.date]) -> dict[dt.date, str | None]:
+    """Caches menus and their MarkdownV2 messages for the given dates."""
+    versions = cache.get_versions(dates)
+    menus = _fetch_menus(versions)
+    menu_messages = _render_menus(menus)
+    cache.set_many("menu", menus, versions)
+    cache.set_many("message", menu_messages, versions)
+    return menu_messages
+
+
+def _render_menus(menus: dict[dt.date, typing.Any]) -> dict[dt.date, str | None]:
+    return {
+        date: None if menu_recipes is None else messages.menu(menu_recipes)
+        for date, menu_recipes in menus.items()
+    }
+
+
+def _fetch_menus(
+    dates: Iterable[dt.date],
+) -> dict[dt.date, collections.defaultdict[str, list[str]] | None]:
+    menus: dict[dt.date, collections.defaultdict[str, list[str]] | None]
+    menus = dict.fromkeys(dates)
+    for menu in _menus_queryset(menus):
+        _add_menu(menus, menu)
+    return menus
+
+
+async def _afetch_menus(
+    dates: Iterable[dt.date],
+) -> dict[dt.date, collections.defaultdict[str, list[str]] | None]:
+    menus: dict[dt.date, collections.defaultdict[str, list[str]] | None]
+    menus = dict.fromkeys(dates)
+    async for menu in _menus_queryset(menus):
+        _add_menu(menus, menu)
+    return menus
+
+
+def _menus_queryset(dates: Iterable[dt.date]) -> QuerySet[models.Menu]:
+    return models.Menu.objects.filter(date__in=dates).prefetch_related(
+        Prefetch(
+            "menu_recipes",
+            queryset=models.MenuRecipes.objects.select_related("recipe"),
+        )
     )
+
+
+def _add_menu(menus: dict, menu: models.Menu) -> None:
+    menu_recipes = menus[menu.date] = collections.defaultdict(list)
     for menu_recipe in menu.menu_recipes.all():
         mealtime = menu_recipe.get_mealtime_display()
         menu_recipes[mealtime].append(menu_recipe.recipe.name)
-    return menu_recipes
 
 
-@sync_to_async(thread_sensitive=False)
-def get_grocery_list(from_date: dt.date, to_date: dt.date) -> list[str]:
-    products = (
-        models.Menu.objects.filter(
-            date__gte=from_date,
-            date__lte=to_date,
-            menu_recipes__recipe__ingredients__product__show_in_grocery_list=True,
+@metrics.instrument("service")
+def copy_menus(
+    source_dates: Iterable[dt.date], start: dt.date, replace: bool = False
+) -> PlannedMenus:
+    """Copies menus to the dates starting at `start`, keeping their spacing."""
+    source_dates = sorted(source_dates)
+    offset = start - source_dates[0]
+    return _plan_menus({date + offset: date for date in source_dates}, replace)
+
+
+@metrics.instrument("service")
+def repeat_menus(
+    source_dates: Iterable[dt.date],
+    start: dt.date,
+    until: dt.date,
+    every_days: int,
+    replace: bool = False,
+) -> PlannedMenus:
+    """Copies menus to `start`, then again every `every_days` days until `until`."""
+    source_dates = sorted(source_dates)
+    plan = {}
+    for first in range(0, (until - start).days + 1, every_days):
+        offset = start + dt.timedelta(days=first) - source_dates[0]
+        plan.update(
+            (date + offset, date) for date in source_dates if date + offset <= until
         )
-        .prefetch_related(
-            "menu_recipes",
-            "menu_recipes__recipe",
-            "menu_recipes__recipe__ingredients",
-            "menu_recipes__recipe__ingredients__product",
+    return _plan_menus(plan, replace)
+
+
+def _plan_menus(plan: dict[dt.date, dt.date], replace: bool) -> PlannedMenus:
+    """Fills target dates with the recipes of source dates in one transaction.
+
+    Dates that already have a menu are skipped unless `replace` is set, then
+    their recipes are replaced.
+    """
+    if len(plan) > MAX_PLANNED_MENUS:
+        raise ValueError(f"Не больше {MAX_PLANNED_MENUS} меню за раз")
+    with transaction.atomic():
+        source_recipes = collections.defaultdict(list)
+        for menu_recipe in models.MenuRecipes.objects.filter(
+            menu__date__in=set(plan.values())
+        ).values("menu__date", "recipe_id", "mealtime", "mealtime_order", "count"):
+            source_recipes[menu_recipe.pop("menu__date")].append(menu_recipe)
+
+        menu_ids = dict(
+            models.Menu.objects.filter(date__in=plan).values_list("date", "id")
+        )
+        skipped = [] if replace else sorted(menu_ids)
+        written = sorted(date for date in plan if date not in skipped)
+        if replace and menu_ids:
+            # Bulk writes skip the signals, the caches are refreshed once below.
+            _delete_menu_recipes(list(menu_ids.values()))
+        models.Menu.objects.bulk_create(
+            models.Menu(date=date) for date in written if date not in menu_ids
         )
-        .values_list("menu_recipes__recipe__ingredients__product__name", flat=True)
+        # SQLite before 3.35 doesn't return the ids of bulk inserted rows.
+        menu_ids.update(
+            models.Menu.objects.filter(date__in=written).values_list("date", "id")
+        )
+        models.MenuRecipes.objects.bulk_create(
+            models.MenuRecipes(menu_id=menu_ids[date], **menu_recipe)
+            for date in written
+            for menu_recipe in source_recipes[plan[date]]
+        )
+        transaction.on_commit(functools.partial(_refresh_menus, written), robust=True)
+    return PlannedMenus(written, skipped)
+
+
+def _delete_menu_recipes(menu_ids: list[int]) -> None:
+    table = connection.ops.quote_name(models.MenuRecipes._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(menu_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE menu_id IN ({placeholders})", menu_ids
+        )
+
+
+def _refresh_menus(dates: list[dt.date]) -> None:
+    cache.invalidate(dates)
+    render_menus(dates)
+
+
+@metrics.instrument("service")
+async def get_grocery_list(from_date: dt.date, to_date: dt.date) -> list[GroceryItem]:
+    dates = [
+        from_date + dt.timedelta(days=days)
+        for days in range((to_date - from_date).days + 1)
+    ]
+    grocery_lists, versions = await cache.aget_many("grocery", dates)
+    if missing_dates := [date for date in dates if date not in grocery_lists]:
+        fetched = await _fetch_grocery_lists(missing_dates)
+        await cache.aset_many("grocery", fetched, versions)
+        grocery_lists.update(fetched)
+
+    weights: collections.Counter[str] = collections.Counter()
+    for grocery_list in grocery_lists.values():
+        for name, weight in grocery_list:
+            weights[name] += weight
+    return [GroceryItem(name, weights[name]) for name in sorted(weights)]
+
+
+@metrics.instrument("service")
+async def iter_grocery_list(
+    from_date: dt.date, to_date: dt.date
+) -> AsyncIterator[GroceryItem]:
+    """Yields the grocery list for a period product by product.
+
+    Short periods are served from the per-date cache, longer ones are streamed
+    from the database without loading the whole list.
+    """
+    if (to_date - from_date).days < settings.GROCERY_CACHE_DAYS:
+        for product in await get_grocery_list(from_date, to_date):
+            yield product
+        return
+    products = grocery_range_queryset(from_date, to_date)
+    async for product in products.aiterator(chunk_size=GROCERY_CHUNK_SIZE):
+        yield GroceryItem(product["name"], product["total_weight"])
+
+
+def grocery_queryset(
+    dates: list[dt.date],
+) -> QuerySet[models.Product, dict[str, typing.Any]]:
+    return _grocery_queryset(
+        ["ingredient__recipe__breakfast_recipes__menu__date", "name"],
+        date__in=dates,
+    )
+
+
+def grocery_range_queryset(
+    from_date: dt.date, to_date: dt.date
+) -> QuerySet[models.Product, dict[str, typing.Any]]:
+    return _grocery_queryset(["name"], date__range=(from_date, to_date))
+
+
+def _grocery_queryset(
+    group_by: list[str], **menu_filter
+) -> QuerySet[models.Product, dict[str, typing.Any]]:
+    # Ingredient weight is given for all portions of the recipe.
+    return (
+        models.Product.objects.filter(
+            show_in_grocery_list=True,
+            **{
+                f"ingredient__recipe__breakfast_recipes__menu__{lookup}": value
+                for lookup, value in menu_filter.items()
+            },
+        )
+        .values(*group_by)
+        .annotate(
+            total_weight=Sum(
+                F("ingredient__weight")
+                * F("ingredient__recipe__breakfast_recipes__count")
+                / F("ingredient__recipe__num_portions"),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("name")
+    )
+
+
+async def _fetch_grocery_lists(
+    dates: list[dt.date],
+) -> dict[dt.date, list[GroceryItem]]:
+    grocery_lists: dict[dt.date, list[GroceryItem]] = {date: [] for date in dates}
+    async for product in grocery_queryset(dates):
+        date = product["ingredient__recipe__breakfast_recipes__menu__date"]
+        grocery_lists[date].append(
+            GroceryItem(product["name"], product["total_weight"])
+        )
+    return grocery_lists
+
+
+@metrics.instrument("service")
+async def what_can_i_cook(
+    products: list[str], limit: int = COOK_LIMIT
+) -> list[cooking.CookMatch]:
+    return await sync_to_async(cooking.what_can_i_cook)(products, limit)
+
+
+@metrics.instrument("service")
+async def find_recipes(query: str, limit: int = FIND_LIMIT) -> list[str]:
+    recipes = await sync_to_async(search.ranked_recipes)(query, limit)
+    return [name for _, name in recipes]
+
+
+@metrics.instrument("service")
+async def get_subscriber_chat_ids() -> list[int]:
+    return [chat_id async for chat_id in subscribers_queryset()]
+
+
+def subscribers_queryset() -> QuerySet[models.Subscriber, int]:
+    return models.Subscriber.objects.filter(is_active=True).values_list(
+        "chat_id", flat=True
     )
-    return sorted(set(products))
@@ -0,0 +1,173 @@
+import datetime as dt
+import threading
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from eda.food import cache, cooking, models, rollups, search, services
+
+_pending = threading.local()
+
+
+def _refresh() -> None:
+    # Every save in a transaction schedules a refresh, the first one does the work.
+    if dates := getattr(_pending, "dates", None):
+        _pending.dates = set()
+        cache.invalidate(dates)
+        services.render_menus(dates)
+
+
+def _refresh_on_commit(dates: Iterable[dt.date]) -> None:
+    if dates := set(dates):
+        if not hasattr(_pending, "dates"):
+            _pending.dates = set()
+        _pending.dates |= dates
+        transaction.on_commit(_refresh, robust=True)
+
+
+@receiver(pre_save, sender=models.Menu)
+def remember_menu_date(sender, instance: models.Menu, **kwargs) -> None:
+    instance._original_date = (
+        models.Menu.objects.filter(pk=instance.pk)
+        .values_list("date", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=models.Menu)
+@receiver(post_delete, sender=models.Menu)
+def menu_changed(sender, instance: models.Menu, **kwargs) -> None:
+    dates = {instance.date}
+    if original_date := getattr(instance, "_original_date", None):
+        dates.add(original_date)
+    _refresh_on_commit(dates)
+
+
+@receiver(post_save, sender=models.MenuRecipes)
+@receiver(post_delete, sender=models.MenuRecipes)
+def menu_recipe_changed(sender, instance: models.MenuRecipes, **kwargs) -> None:
+    _refresh_on_commit(
+        models.Menu.objects.filter(pk=instance.menu_id).values_list("date", flat=True)
+    )
+
+
+@receiver(post_save, sender=models.Recipe)
+@receiver(post_delete, sender=models.Recipe)
+def recipe_changed(sender, instance: models.Recipe, **kwargs) -> None:
+    _refresh_on_commit(
+        models.Menu.objects.filter(menu_recipes__recipe=instance).values_list(
+            "date", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=models.Ingredient)
+@receiver(post_delete, sender=models.Ingredient)
+def ingredient_changed(sender, instance: models.Ingredient, **kwargs) -> None:
+    _refresh_on_commit(
+        models.Menu.objects.filter(
+            menu_recipes__recipe_id=instance.recipe_id
+        ).values_list("date", flat=True)
+    )
+
+
+@receiver(post_save, sender=models.Product)
+@receiver(post_delete, sender=models.Product)
+def product_changed(sender, instance: models.Product, **kwargs) -> None:
+    _refresh_on_commit(
+        models.Menu.objects.filter(
+            menu_recipes__recipe__ingredients__product=instance
+        ).values_list("date", flat=True)
+    )
+
+
+# The search index and the rollups are updated in the same transaction as the
+# change.
+
+
+def _update_recipes(recipe_ids: Iterable[int]) -> None:
+    recipe_ids = set(recipe_ids)
+    search.index_recipes(recipe_ids)
+    rollups.refresh(recipe_ids)
+
+
+@receiver(post_save, sender=models.Recipe)
+@receiver(post_delete, sender=models.Recipe)
+def update_recipe(sender, instance: models.Recipe, **kwargs) -> None:
+    _update_recipes([instance.pk])
+
+
+def _deleting_recipes(origin) -> bool:
+    return isinstance(origin, models.Recipe) or (
+        isinstance(origin, QuerySet) and origin.model is models.Recipe
+    )
+
+
+@receiver(post_save, sender=models.Ingredient)
+@receiver(post_delete, sender=models.Ingredient)
+def update_ingredient_recipe(
+    sender, instance: models.Ingredient, origin=None, **kwargs
+) -> None:
+    # The recipe itself is being deleted: its rollup is already gone, and
+    # refreshing would recreate it for a row that won't exist at commit.
+    if _deleting_recipes(origin):
+        return
+    _update_recipes([instance.recipe_id])
+
+
+@receiver(post_save, sender=models.Product)
+def update_product_recipes(sender, instance: models.Product, **kwargs) -> None:
+    search.index_recipes(
+        models.Ingredient.objects.filter(product=instance).values_list(
+            "recipe_id", flat=True
+        )
+    )
+
+
+@receiver(pre_delete, sender=models.Tag)
+def remember_tag_recipes(sender, instance: models.Tag, **kwargs) -> None:
+    instance._recipe_ids = list(instance.recipe_set.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=models.Tag)
+@receiver(post_delete, sender=models.Tag)
+def update_tag_recipes(sender, instance: models.Tag, **kwargs) -> None:
+    if (recipe_ids := getattr(instance, "_recipe_ids", None)) is None:
+        recipe_ids = instance.recipe_set.values_list("id", flat=True)
+    _update_recipes(recipe_ids)
+
+
+@receiver(m2m_changed, sender=models.Recipe.tags.through)
+def update_recipe_tags(
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    if not reverse:
+        if action.startswith("post_"):
+            _update_recipes([instance.pk])
+    elif action == "pre_clear":
+        remember_tag_recipes(sender, instance)
+    elif action == "post_clear":
+        _update_recipes(instance._recipe_ids)
+    elif action in ("post_add", "post_remove"):
+        _update_recipes(pk_set)
+
+
+@receiver(post_save, sender=models.Ingredient)
+@receiver(post_delete, sender=models.Ingredient)
+def record_ingredient_change(sender, instance: models.Ingredient, **kwargs) -> None:
+    cooking.record_changes([instance.recipe_id])
+
+
+@receiver(post_save, sender=models.Product)
+@receiver(post_delete, sender=models.Product)
+def record_product_change(sender, instance: models.Product, **kwargs) -> None:
+    cooking.record_changes([None])
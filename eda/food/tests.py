@@ -0,0 +1,393 @@
+import datetime as dt
+import os
+import re
+import subprocess
+import sys
+import zoneinfo
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Prefetch, QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from eda.food import cache, catalogue, cooking, models, scheduling, services
+
+# "SCAN recipes USING INDEX ..." walks an index in order and is fine for
+# paginated lists, a bare "SCAN recipes" reads the whole table.
+FULL_SCAN = re.compile(r"\bSCAN (\w+)$", re.MULTILINE)
+
+# About twice what the entry points take now, see benchmarks/import_time.py.
+IMPORT_BUDGET_MS = 1500
+# Module prefixes that mean a startup regression.
+WORKER_FORBIDDEN = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.messages",
+    "django.contrib.sessions",
+    "django.contrib.staticfiles",
+]
+FORBIDDEN_IMPORTS = {
+    "eda.bot": WORKER_FORBIDDEN,
+    "eda.beat": [*WORKER_FORBIDDEN, "telegram.ext"],
+    "eda.worker": WORKER_FORBIDDEN,
+}
+
+# The admin templates would look up hashed names in a manifest that tests
+# don't build.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(STORAGES=STORAGES)
+class MenuAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin")
+        recipes = [
+            models.Recipe.objects.create(name=f"Блюдо {number}") for number in range(3)
+        ]
+        menus = models.Menu.objects.bulk_create(
+            models.Menu(date=dt.date(2024, 1, 1) + dt.timedelta(days=day))
+            for day in range(40)
+        )
+        models.MenuRecipes.objects.bulk_create(
+            models.MenuRecipes(
+                menu=menu,
+                recipe=recipe,
+                mealtime=mealtime,
+                mealtime_order=mealtime.order,
+            )
+            for menu in menus
+            for recipe, mealtime in zip(recipes, models.MenuRecipes.Mealtime)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_changelist_queries_do_not_grow_with_page_size(self):
+        model_admin = admin.site.get_model_admin(models.Menu)
+        for page_size in (5, 40):
+            with self.subTest(page_size=page_size), mock.patch.object(
+                model_admin, "list_per_page", page_size
+            ):
+                # Session, user, two counts, the menus and their recipes.
+                with self.assertNumQueries(6):
+                    response = self.client.get("/admin/food/menu/")
+                self.assertEqual(len(response.context["cl"].result_list), page_size)
+                self.assertContains(response, "Блюдо 2")
+
+
+class RecipeAdminTests(TestCase):
+    def test_columns_of_recipe_without_rollup(self):
+        recipe = models.Recipe.objects.create(name="Суп")
+        models.RecipeRollup.objects.filter(recipe=recipe).delete()
+        recipe = models.Recipe.objects.select_related("rollup").get(id=recipe.id)
+        model_admin = admin.site.get_model_admin(models.Recipe)
+
+        self.assertEqual(
+            [
+                model_admin.ingredient_count(recipe),
+                model_admin.weight_per_portion(recipe),
+                model_admin.tags_(recipe),
+            ],
+            [0, 0, ""],
+        )
+
+    def test_delete_recipe_with_ingredients_and_tags(self):
+        recipe = models.Recipe.objects.create(name="Суп")
+        recipe.tags.add(models.Tag.objects.create(name="Первое"))
+        for name in ("Вода", "Картофель"):
+            product = models.Product.objects.create(name=name)
+            models.Ingredient.objects.create(recipe=recipe, product=product, weight=100)
+        self.assertTrue(models.RecipeRollup.objects.filter(recipe=recipe).exists())
+
+        recipe_id = recipe.id
+        recipe.delete()
+
+        self.assertFalse(
+            models.RecipeRollup.objects.filter(recipe_id=recipe_id).exists()
+        )
+        # The foreign keys are only checked on commit, which TestCase skips.
+        connection.check_constraints()
+
+
+class MenuPlanningTests(TestCase):
+    def test_copy_replaces_recipes_of_existing_menus(self):
+        soup, salad = (
+            models.Recipe.objects.create(name=name) for name in ("Суп", "Салат")
+        )
+        source, target, other = (
+            models.Menu.objects.create(date=dt.date(2024, 1, day)) for day in (1, 2, 3)
+        )
+        lunch = models.MenuRecipes.Mealtime.LUNCH
+        models.MenuRecipes.objects.create(menu=source, recipe=soup, mealtime=lunch)
+        models.MenuRecipes.objects.create(menu=target, recipe=salad, mealtime=lunch)
+        models.MenuRecipes.objects.create(menu=other, recipe=salad, mealtime=lunch)
+
+        planned = services.copy_menus([source.date], target.date, replace=True)
+
+        self.assertEqual(planned.written, [target.date])
+        self.assertQuerySetEqual(
+            target.menu_recipes.values_list("recipe__name", flat=True), ["Суп"]
+        )
+        self.assertEqual(other.menu_recipes.count(), 1)
+
+    def test_copy_to_new_date_without_returned_ids(self):
+        soup = models.Recipe.objects.create(name="Суп")
+        source = models.Menu.objects.create(date=dt.date(2024, 1, 1))
+        models.MenuRecipes.objects.create(
+            menu=source, recipe=soup, mealtime=models.MenuRecipes.Mealtime.LUNCH
+        )
+
+        # As on SQLite before 3.35.
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            services.copy_menus([source.date], dt.date(2024, 1, 5))
+
+        self.assertQuerySetEqual(
+            models.MenuRecipes.objects.filter(
+                menu__date=dt.date(2024, 1, 5)
+            ).values_list("recipe__name", flat=True),
+            ["Суп"],
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MenuCacheTests(SimpleTestCase):
+    def test_entry_read_before_invalidation_is_not_served(self):
+        date = dt.date(2024, 1, 1)
+        _, versions = cache.get_many("grocery", [date])
+        # A commit invalidates the date while the reader queries the database.
+        cache.invalidate([date])
+        cache.set_many("grocery", {date: [("Мука", 200.0)]}, versions)
+
+        self.assertEqual(cache.get_many("grocery", [date])[0], {})
+
+        _, versions = cache.get_many("grocery", [date])
+        cache.set_many("grocery", {date: []}, versions)
+        self.assertEqual(cache.get_many("grocery", [date])[0], {date: []})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CatalogueImportTests(TestCase):
+    def test_product_update_invalidates_grocery_lists(self):
+        recipe = models.Recipe.objects.create(name="Блины")
+        flour = models.Product.objects.create(name="Мука")
+        models.Ingredient.objects.create(recipe=recipe, product=flour, weight=200)
+        menu = models.Menu.objects.create(date=dt.date(2024, 1, 1))
+        models.MenuRecipes.objects.create(
+            menu=menu, recipe=recipe, mealtime=models.MenuRecipes.Mealtime.BREAKFAST
+        )
+        cache.set_many(
+            "grocery", {menu.date: [("Мука", 200.0)]}, cache.get_versions([menu.date])
+        )
+
+        importer = catalogue.Importer()
+        importer.add("product", {"name": "Мука", "show_in_grocery_list": "0"})
+        importer.finish()
+
+        self.assertEqual(cache.get_many("grocery", [menu.date])[0], {})
+
+
+class CookIndexTests(TestCase):
+    @mock.patch.object(cooking, "KEPT_CHANGES", 2)
+    def test_sync_prunes_old_changes(self):
+        index = cooking.CookIndex()
+        index.rebuild()
+        cooking.record_changes(range(1, 6))
+        index.sync()
+        cooking.record_changes(range(6, 9))
+        index.sync()
+
+        self.assertEqual(models.IngredientChange.objects.count(), 2)
+
+
+class SchedulerTests(TestCase):
+    due = dt.datetime(2024, 1, 2, 9, tzinfo=dt.UTC)
+    grace_period = dt.timedelta(hours=1)
+    lease = dt.timedelta(minutes=5)
+    epsilon = dt.timedelta(seconds=1)
+
+    def setUp(self):
+        self.runs = 0
+        self.failures = 0
+        self.job = scheduling.DailyJob(
+            "send_today_menu", dt.time(9), self._handle, zoneinfo.ZoneInfo("UTC")
+        )
+        self.scheduler = scheduling.Scheduler(
+            [self.job], grace_period=self.grace_period, lease=self.lease
+        )
+        models.Job.objects.create(name=self.job.name)
+
+    async def _handle(self) -> None:
+        self.runs += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError
+
+    async def _run_pending_at(self, now: dt.datetime) -> dt.datetime:
+        with mock.patch.object(scheduling.timezone, "now", return_value=now):
+            return await self.scheduler._run_pending(self.job)
+
+    async def test_claims_a_due_time_once(self):
+        locked_until = self.due + self.lease
+        claims = [
+            await scheduling._claim_job(self.job.name, self.due, self.due, locked_until)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(claims, [True, False])
+
+    async def test_runs_when_due(self):
+        wakeup = await self._run_pending_at(self.due)
+
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(wakeup, self.due + dt.timedelta(days=1))
+        # A replica checking right after doesn't run it again.
+        await self._run_pending_at(self.due + self.epsilon)
+        self.assertEqual(self.runs, 1)
+
+    async def test_catches_up_within_grace_period(self):
+        await self._run_pending_at(self.due + self.grace_period - self.epsilon)
+
+        self.assertEqual(self.runs, 1)
+
+    async def test_skips_runs_past_grace_period(self):
+        wakeup = await self._run_pending_at(self.due + self.grace_period + self.epsilon)
+
+        self.assertEqual(self.runs, 0)
+        self.assertEqual(wakeup, self.due + dt.timedelta(days=1))
+
+    async def test_retries_failed_run_after_lease(self):
+        self.failures = 1
+
+        with self.assertLogs(scheduling.logger, "ERROR"):
+            wakeup = await self._run_pending_at(self.due)
+        self.assertEqual(wakeup, self.due + self.lease)
+        await self._run_pending_at(self.due + self.lease - self.epsilon)
+        self.assertEqual(self.runs, 1)
+        await self._run_pending_at(self.due + self.lease)
+
+        self.assertEqual(self.runs, 2)
+        self.assertTrue(await scheduling._is_job_done(self.job.name, self.due))
+
+
+class QueryPlanTests(TestCase):
+    """Hot service and admin queries must not plan a full table scan."""
+
+    def test_no_full_table_scans(self):
+        for name, queryset in _querysets():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertEqual(FULL_SCAN.findall(plan), [], plan)
+
+
+def _querysets() -> list[tuple[str, QuerySet]]:
+    today = dt.date.today()
+    querysets = [
+        ("menus", models.Menu.objects.filter(date__in=[today])),
+        (
+            "menu recipes",
+            models.MenuRecipes.objects.filter(menu_id=1).select_related("recipe"),
+        ),
+        ("grocery list", services.grocery_queryset([today])),
+        (
+            "grocery list range",
+            services.grocery_range_queryset(today, today + dt.timedelta(days=13)),
+        ),
+        ("subscribers", services.subscribers_queryset()),
+        ("jobs", models.Job.objects.filter(name="send_today_menu")),
+    ]
+
+    request = RequestFactory().get("/admin/")
+    request.user = User(is_active=True, is_staff=True, is_superuser=True)
+    for model, model_admin in admin.site._registry.items():
+        if model._meta.app_label != "food":
+            continue
+        changelist = model_admin.get_changelist_instance(request)
+        queryset = changelist.get_queryset(request)
+        querysets.append(
+            (
+                f"{model._meta.model_name} changelist",
+                queryset[: changelist.list_per_page],
+            )
+        )
+        for lookup in queryset._prefetch_related_lookups:
+            querysets.append(
+                (
+                    f"{model._meta.model_name} changelist prefetch",
+                    _prefetch_queryset(model, lookup),
+                )
+            )
+
+    # Lookups of the inline autocomplete widgets.
+    request = RequestFactory().get(reverse("admin:autocomplete"))
+    request.user = User(is_active=True, is_staff=True, is_superuser=True)
+    for model in (models.Product, models.Recipe):
+        model_admin = admin.site._registry[model]
+        queryset, _ = model_admin.get_search_results(
+            request, model_admin.get_queryset(request), "а"
+        )
+        querysets.append((f"{model._meta.model_name} autocomplete", queryset[:20]))
+    return querysets
+
+
+def _prefetch_queryset(model, lookup: str | Prefetch) -> QuerySet:
+    if not isinstance(lookup, Prefetch):
+        lookup = Prefetch(lookup)
+    field = model._meta.get_field(lookup.prefetch_through)
+    if field.many_to_many:
+        through = getattr(model, field.name).through
+        return through.objects.filter(
+            **{f"{model._meta.model_name}_id__in": [1]}
+        ).select_related(field.related_model._meta.model_name)
+    queryset = lookup.queryset or field.related_model.objects.all()
+    return queryset.filter(**{f"{field.field.name}_id__in": [1]})
+
+
+class ImportTimeTests(SimpleTestCase):
+    """Worker entry points start without the admin apps and within budget."""
+
+    def test_entry_points(self):
+        for module, forbidden in FORBIDDEN_IMPORTS.items():
+            with self.subTest(module):
+                times = _import_times(module)
+                self.assertEqual(
+                    [
+                        name
+                        for name in times
+                        for prefix in forbidden
+                        if name == prefix or name.startswith(f"{prefix}.")
+                    ],
+                    [],
+                )
+                self.assertLess(sum(times.values()) / 1000, IMPORT_BUDGET_MS)
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Self import time in microseconds of every module a fresh process imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(settings.BASE_DIR.parent)},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(self_us)
+    return times
@@ -0,0 +1,113 @@
+import asyncio
+import collections
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from eda.core import settings
+
+logger = logging.getLogger(__name__)
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+PRIVATE_CHAT_RATE = 1.0
+GROUP_CHAT_RATE = 20 / 60
+CHAT_BURST = 3
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    elapsed = now - self._updated
+                    self._tokens = min(
+                        self.capacity, self._tokens + elapsed * self.rate
+                    )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Dispatcher:
+    """Sends the same messages to many chats within Telegram's rate limits.
+
+    Chats are served concurrently, at most `concurrency` at a time, messages
+    within a chat are sent in order.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        concurrency: int = settings.BROADCAST_CONCURRENCY,
+        global_rate: float = settings.BROADCAST_GLOBAL_RATE,
+        max_retries: int = settings.BROADCAST_MAX_RETRIES,
+        backoff: float = 1.0,
+    ) -> None:
+        self.bot = bot
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._global_bucket = TokenBucket(global_rate, capacity=global_rate)
+
+    async def broadcast(
+        self, chat_ids: Iterable[int], messages: list[tuple[str, dict[str, Any]]]
+    ) -> collections.Counter[str]:
+        """Returns the number of chats per outcome: sent, forbidden or failed."""
+        results = await asyncio.gather(
+            *(self._send_chat(chat_id, messages) for chat_id in set(chat_ids))
+        )
+        return collections.Counter(results)
+
+    async def _send_chat(
+        self, chat_id: int, messages: list[tuple[str, dict[str, Any]]]
+    ) -> str:
+        # Negative ids are groups and channels, they have a stricter limit.
+        rate = GROUP_CHAT_RATE if chat_id < 0 else PRIVATE_CHAT_RATE
+        bucket = TokenBucket(rate, capacity=CHAT_BURST)
+        async with self._semaphore:
+            for text, kwargs in messages:
+                try:
+                    await self._send(bucket, chat_id, text, kwargs)
+                except Forbidden:
+                    logger.info("Chat %s has blocked the bot", chat_id)
+                    return "forbidden"
+                except Exception:
+                    logger.exception("Failed to send a message to chat %s", chat_id)
+                    return "failed"
+        return "sent"
+
+    async def _send(
+        self, bucket: TokenBucket, chat_id: int, text: str, kwargs: dict[str, Any]
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            await self._global_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id, text, **kwargs)
+            except RetryAfter as exc:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(exc.retry_after)
+            except BadRequest:
+                raise
+            except NetworkError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2**attempt)
+            else:
+                return
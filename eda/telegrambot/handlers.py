@@ -0,0 +1,123 @@
+import datetime as dt
+
+from telegram import Update
+from telegram.ext import Application, CommandHandler, ContextTypes, filters
+
+from eda.core import metrics, settings
+from eda.food import cache, models, services
+from eda.telegrambot import messages
+from eda.telegrambot.utils import parse_date
+
+GROCERY_LIST_MAX_DAYS = 62
+
+
+@metrics.instrument("handler")
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await update.get_bot().send_message(update.message.chat_id, messages.HELP)
+
+
+@metrics.instrument("handler")
+async def grocery_list_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    try:
+        from_date, to_date = _parse_period(context.args or [])
+    except ValueError:
+        await update.message.reply_text(messages.GROCERY_LIST_USAGE)
+        return
+
+    products = services.iter_grocery_list(from_date, to_date)
+    is_empty = True
+    async for message in messages.grocery_list(products):
+        await update.message.reply_text(message)
+        is_empty = False
+    if is_empty:
+        await update.message.reply_text("Список покупок пуст")
+
+
+def _parse_period(args: list[str]) -> tuple[dt.date, dt.date]:
+    today = dt.date.today()
+    match args:
+        case []:
+            return today, today + dt.timedelta(days=1)
+        case [days] if days.isdigit() and 0 < int(days) <= GROCERY_LIST_MAX_DAYS:
+            return today, today + dt.timedelta(days=int(days) - 1)
+        case [from_value, to_value]:
+            from_date, to_date = parse_date(from_value), parse_date(to_value)
+            if to_date < from_date:
+                to_date = to_date.replace(year=to_date.year + 1)
+            if (to_date - from_date).days < GROCERY_LIST_MAX_DAYS:
+                return from_date, to_date
+    raise ValueError
+
+
+@metrics.instrument("handler")
+async def cook_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    text = " ".join(context.args or [])
+    # Products are comma-separated, single-word ones may be space-separated.
+    if not (products := text.split(",") if "," in text else context.args):
+        await update.message.reply_text(messages.COOK_USAGE)
+        return
+    matches = await services.what_can_i_cook(products)
+    await update.message.reply_text(messages.cook_matches(matches))
+
+
+@metrics.instrument("handler")
+async def find_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not (query := " ".join(context.args or [])):
+        await update.message.reply_text(messages.FIND_USAGE)
+        return
+    names = await services.find_recipes(query)
+    await update.message.reply_text(messages.found_recipes(names))
+
+
+@metrics.instrument("handler")
+async def cache_stats_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    await update.message.reply_text(messages.cache_stats(cache.get_stats()))
+
+
+async def _send_menu_at(menu_date: dt.date, update: Update) -> None:
+    try:
+        if not (message := await services.get_menu_message_at(menu_date)):
+            raise ValueError
+    except (models.Menu.DoesNotExist, ValueError):
+        await update.message.reply_text("Меню не сформировано")
+    else:
+        await update.message.reply_markdown_v2(message)
+
+
+@metrics.instrument("handler")
+async def today_menu_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    await _send_menu_at(dt.date.today(), update)
+
+
+@metrics.instrument("handler")
+async def tomorrow_menu_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    await _send_menu_at(dt.date.today() + dt.timedelta(days=1), update)
+
+
+def register(application: Application) -> None:
+    application.add_handler(CommandHandler("help", help_command))
+    application.add_handler(CommandHandler("start", help_command))
+
+    chat_filter = filters.Chat(settings.TELEGRAM_CHAT_ID)
+    application.add_handler(
+        CommandHandler("cachestats", cache_stats_command, filters=chat_filter)
+    )
+    application.add_handler(CommandHandler("cook", cook_command, filters=chat_filter))
+    application.add_handler(CommandHandler("find", find_command, filters=chat_filter))
+    application.add_handler(
+        CommandHandler("list", grocery_list_command, filters=chat_filter)
+    )
+    application.add_handler(
+        CommandHandler("today", today_menu_command, filters=chat_filter)
+    )
+    application.add_handler(
+        CommandHandler("tomorrow", tomorrow_menu_command, filters=chat_filter)
+    )
@@ -1,9 +1,27 @@
 import datetime as dt
+from collections.abc import AsyncIterable, AsyncIterator
+
+from telegram.constants import MessageLimit
 
 from . import utils
 
-HELP = """\
+COOK_USAGE = """\
+/cook ПРОДУКТ, ПРОДУКТ — что приготовить из этих продуктов
+"""
+
+FIND_USAGE = """\
+/find СЛОВА — поиск блюд по названию, инструкции, продуктам и тегам
+"""
+
+HELP = f"""\
 Бот для управления https://github.com/askvrtsv/eda
+
+{COOK_USAGE}{FIND_USAGE}"""
+
+GROCERY_LIST_USAGE = """\
+/list — список покупок на сегодня и завтра
+/list N — на N дней, начиная с сегодня
+/list ДД.ММ ДД.ММ — за период
 """
 
 
@@ -19,5 +37,47 @@ def menu(menu: dict[str, list[str]]) -> str:
     return "\n\n".join(lines).strip()
 
 
+def cook_matches(matches: list[tuple[str, int, int, list[str]]]) -> str:
+    if not matches:
+        return "Ничего не нашлось"
+    lines = []
+    for number, (name, matched, total, missing) in enumerate(matches, 1):
+        line = f"{number}. {name} — {matched}/{total}"
+        if missing:
+            line += f", не хватает: {', '.join(missing)}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def found_recipes(names: list[str]) -> str:
+    if not names:
+        return "Ничего не найдено"
+    return "\n".join(f"{number}. {name}" for number, name in enumerate(names, 1))
+
+
 def menu_date(menu_date: dt.date) -> str:
     return f"Меню на {utils.format_date(menu_date)}"
+
+
+async def grocery_list(
+    products: AsyncIterable[tuple[str, float]],
+    limit: int = MessageLimit.MAX_TEXT_LENGTH,
+) -> AsyncIterator[str]:
+    """Packs the products into as few messages under `limit` as possible."""
+    lines: list[str] = []
+    length = 0
+    async for name, weight in products:
+        line = f"{name} — {round(weight)} г"
+        if lines and length + 1 + len(line) > limit:
+            yield "\n".join(lines)
+            lines, length = [], 0
+        length += len(line) + (1 if lines else 0)
+        lines.append(line)
+    if lines:
+        yield "\n".join(lines)
+
+
+def cache_stats(stats: dict[str, int]) -> str:
+    if not stats:
+        return "Кэш ещё не использовался"
+    return "\n".join(f"{name}: {value}" for name, value in sorted(stats.items()))
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from django.test import SimpleTestCase
+from telegram import Update
+
+from eda.telegrambot import updates
+
+
+def _update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": "/list",
+            },
+        },
+        None,
+    )
+
+
+class ChatOrderedUpdateProcessorTests(SimpleTestCase):
+    async def _process(self, workers: int, batch: list[Update]) -> dict[int, list[int]]:
+        processor = updates.ChatOrderedUpdateProcessor(workers, max_pending=16)
+        handled: dict[int, list[int]] = {}
+        self.max_running = running = 0
+
+        async def handle(update: Update) -> None:
+            nonlocal running
+            running += 1
+            self.max_running = max(self.max_running, running)
+            # Later updates finish first unless they wait for their turn.
+            await asyncio.sleep(0.005 * (len(batch) - update.update_id))
+            handled.setdefault(update.effective_chat.id, []).append(update.update_id)
+            running -= 1
+
+        # Mirrors Application: one task per update, created in arrival order.
+        await asyncio.gather(
+            *(processor.process_update(update, handle(update)) for update in batch)
+        )
+        return handled
+
+    async def test_keeps_chat_order(self):
+        batch = [_update(update_id, update_id % 2) for update_id in range(8)]
+
+        handled = await self._process(4, batch)
+
+        self.assertEqual(handled, {0: [0, 2, 4, 6], 1: [1, 3, 5, 7]})
+        self.assertEqual(self.max_running, 2)
+
+    async def test_limits_running_updates(self):
+        batch = [_update(update_id, update_id) for update_id in range(8)]
+
+        await self._process(3, batch)
+
+        self.assertEqual(self.max_running, 3)
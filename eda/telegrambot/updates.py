@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable
+from typing import Any, AsyncContextManager
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from eda.core import metrics
+
+updates_pending = metrics.Gauge(
+    "eda_updates_pending",
+    "Updates admitted but waiting for their chat or a free worker.",
+)
+updates_running = metrics.Gauge("eda_updates_running", "Updates being processed.")
+update_wait_seconds = metrics.Histogram(
+    "eda_update_wait_seconds", "Time an update waited before processing started."
+)
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates from different chats concurrently, one chat in order.
+
+    PTB admits at most `max_pending` updates here at once. Each waits for its
+    chat's lock, then for one of `workers` slots. Updates past `max_pending`
+    wait inside PTB and are not counted as pending.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        super().__init__(max(max_pending, workers))
+        self._workers = asyncio.BoundedSemaphore(workers)
+        # Chat id -> lock and the number of updates holding or awaiting it.
+        self._chats: dict[int, tuple[asyncio.Lock, int]] = {}
+        self._pending = 0
+        self._running = 0
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        chat_id = None
+        if isinstance(update, Update) and update.effective_chat:
+            chat_id = update.effective_chat.id
+        queued = time.perf_counter()
+        started = False
+        self._set_pending(1)
+        try:
+            # The worker slot is taken after the chat lock, so updates queued
+            # behind a busy chat don't hold one.
+            async with self._chat_lock(chat_id), self._workers:
+                started = True
+                self._set_pending(-1)
+                update_wait_seconds.observe(time.perf_counter() - queued)
+                self._set_running(1)
+                try:
+                    await coroutine
+                finally:
+                    self._set_running(-1)
+        finally:
+            if not started:
+                self._set_pending(-1)
+            self._release_chat(chat_id)
+
+    def _chat_lock(self, chat_id: int | None) -> AsyncContextManager:
+        if chat_id is None:
+            return contextlib.nullcontext()
+        lock, holders = self._chats.get(chat_id, (asyncio.Lock(), 0))
+        self._chats[chat_id] = (lock, holders + 1)
+        return lock
+
+    def _release_chat(self, chat_id: int | None) -> None:
+        if chat_id is None:
+            return
+        lock, holders = self._chats[chat_id]
+        if holders == 1:
+            del self._chats[chat_id]
+        else:
+            self._chats[chat_id] = (lock, holders - 1)
+
+    def _set_pending(self, delta: int) -> None:
+        self._pending += delta
+        updates_pending.set(self._pending)
+
+    def _set_running(self, delta: int) -> None:
+        self._running += delta
+        updates_running.set(self._running)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -1,19 +1,96 @@
 import datetime as dt
 import re
+import time
+import typing
 
-from telegram.ext import Application
+import httpx
+from telegram import Bot
+from telegram.request import HTTPXRequest
 
-from eda.core import settings
+from eda.core import metrics, settings
 
+if typing.TYPE_CHECKING:
+    from telegram.ext import Application
 
-def get_telegram() -> Application:
-    return Application.builder().token(settings.TELEGRAM_TOKEN).build()
+
+class PooledHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest that keeps idle connections open for `keepalive_expiry`.
+
+    Also records the latency of every Bot API call.
+    """
+
+    def __init__(self, *, keepalive_expiry: float, **kwargs) -> None:
+        self._keepalive_expiry = keepalive_expiry
+        super().__init__(**kwargs)
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = self._client_kwargs["limits"]
+        return httpx.AsyncClient(
+            **{
+                **self._client_kwargs,
+                "limits": httpx.Limits(
+                    max_connections=limits.max_connections,
+                    max_keepalive_connections=limits.max_keepalive_connections,
+                    keepalive_expiry=self._keepalive_expiry,
+                ),
+            }
+        )
+
+    async def do_request(self, url: str, *args, **kwargs) -> tuple[int, bytes]:
+        started = time.perf_counter()
+        try:
+            return await super().do_request(url, *args, **kwargs)
+        finally:
+            metrics.telegram_request_seconds.observe(
+                time.perf_counter() - started, method=url.rsplit("/", 1)[-1]
+            )
+
+
+def _get_request() -> PooledHTTPXRequest:
+    return PooledHTTPXRequest(
+        connection_pool_size=settings.TELEGRAM_POOL_SIZE,
+        keepalive_expiry=settings.TELEGRAM_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_telegram() -> "Application":
+    # telegram.ext is only needed to handle updates, beat gets by without it.
+    from telegram.ext import Application
+
+    from eda.telegrambot import updates
+
+    return (
+        Application.builder()
+        .token(settings.TELEGRAM_TOKEN)
+        .concurrent_updates(
+            updates.ChatOrderedUpdateProcessor(
+                settings.BOT_CONCURRENT_UPDATES,
+                max_pending=settings.BOT_MAX_PENDING_UPDATES,
+            )
+        )
+        .base_url(settings.TELEGRAM_API_URL)
+        .request(_get_request())
+        .build()
+    )
+
+
+def get_bot() -> Bot:
+    """A bot for sending messages only, without an update Application."""
+    return Bot(
+        settings.TELEGRAM_TOKEN,
+        base_url=settings.TELEGRAM_API_URL,
+        request=_get_request(),
+    )
 
 
 def escape_markdown(string: str) -> str:
     return re.sub(r"[_*[\]()~>#\+\-=|{}.!]", lambda x: "\\" + x.group(), string)
 
 
+def parse_date(value: str) -> dt.date:
+    return dt.datetime.strptime(f"{value}.{dt.date.today().year}", r"%d.%m.%Y").date()
+
+
 def format_date(date: dt.date) -> str:
     if date == dt.date.today():
         return "сегодня"
@@ -0,0 +1,88 @@
+import asyncio
+import hmac
+import json
+import logging
+
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+)
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from telegram import Update
+from telegram.ext import Application
+
+from eda.core import settings
+from eda.telegrambot import handlers, utils
+
+logger = logging.getLogger(__name__)
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+_application: Application | None = None
+_lock = asyncio.Lock()
+
+
+async def start() -> Application:
+    """Starts the process-wide bot application once."""
+    global _application
+    async with _lock:
+        if _application is None:
+            application = utils.get_telegram()
+            handlers.register(application)
+            await application.initialize()
+            await application.start()
+            _application = application
+    return _application
+
+
+async def stop() -> None:
+    global _application
+    async with _lock:
+        if _application is not None:
+            await _application.stop()
+            await _application.shutdown()
+            _application = None
+
+
+async def lifespan(scope, receive, send) -> None:
+    """Starts and stops the bot with the ASGI server."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                if settings.TELEGRAM_WEBHOOK_SECRET:
+                    await start()
+            except Exception as error:
+                logger.exception("Bot failed to start")
+                await send({"type": "lifespan.startup.failed", "message": str(error)})
+            else:
+                await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+@csrf_exempt
+@require_POST
+async def webhook_view(request: HttpRequest) -> HttpResponse:
+    if not settings.TELEGRAM_WEBHOOK_SECRET:
+        raise Http404
+    secret_token = request.headers.get(SECRET_TOKEN_HEADER, "")
+    if not hmac.compare_digest(secret_token, settings.TELEGRAM_WEBHOOK_SECRET):
+        return HttpResponseForbidden()
+
+    # Servers without lifespan support start the bot on the first update.
+    application = await start()
+    try:
+        update = Update.de_json(json.loads(request.body), application.bot)
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest()
+    # Answer right away: the application processes queued updates concurrently,
+    # and Telegram holds back further updates until the webhook responds.
+    await application.update_queue.put(update)
+    return HttpResponse()
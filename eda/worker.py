@@ -0,0 +1,120 @@
+"""Runs the bot handlers and the scheduled jobs in one process.
+
+Replaces running bot.py and beat.py side by side: both share one event loop,
+one Telegram `Application` and one database connection.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+
+import django
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import Application
+
+# Workers skip the admin apps, see eda.core.worker_settings.
+os.environ["DJANGO_SETTINGS_MODULE"] = "eda.core.worker_settings"
+django.setup()
+
+from eda import beat  # noqa: E402
+from eda.core import metrics, settings  # noqa: E402
+from eda.food import scheduling  # noqa: E402
+from eda.telegrambot import handlers, utils  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+component_up = metrics.Gauge(
+    "eda_worker_component_up", "Whether a worker component is running (1) or not (0)."
+)
+
+
+class Worker:
+    def __init__(self, application: Application) -> None:
+        self.application = application
+        self._scheduler: asyncio.Task | None = None
+        self._polling_failed_at = 0.0
+
+    def health(self) -> dict[str, bool]:
+        # The updater keeps retrying failed getUpdates calls, so polling counts
+        # as down while they keep failing.
+        polling_failing = (
+            time.monotonic() - self._polling_failed_at
+            < 2 * settings.METRICS_DUMP_INTERVAL
+        )
+        return {
+            "handlers": self.application.running,
+            "polling": self.application.updater.running and not polling_failing,
+            "scheduler": self._scheduler is not None and not self._scheduler.done(),
+        }
+
+    async def run(self, stop: asyncio.Event) -> None:
+        async with self.application:
+            await self.application.updater.start_polling(
+                allowed_updates=Update.ALL_TYPES,
+                error_callback=self._on_polling_error,
+            )
+            await self.application.start()
+            scheduler = scheduling.Scheduler(beat.get_jobs(self.application.bot))
+            self._scheduler = asyncio.create_task(scheduler.run(stop))
+            self._scheduler.add_done_callback(self._on_scheduler_done)
+
+            health: dict[str, bool] = {}
+            while not stop.is_set():
+                health = self._report(health)
+                try:
+                    await asyncio.wait_for(
+                        stop.wait(), timeout=settings.METRICS_DUMP_INTERVAL
+                    )
+                except TimeoutError:
+                    pass
+
+            # Stop taking new updates first, then let in-flight handlers and
+            # the current job finish.
+            logger.info("Shutting down")
+            await self.application.updater.stop()
+            await self.application.stop()
+            await asyncio.gather(self._scheduler, return_exceptions=True)
+        for component in health:
+            component_up.set(0, component=component)
+
+    def _report(self, previous: dict[str, bool]) -> dict[str, bool]:
+        health = self.health()
+        for component, up in health.items():
+            component_up.set(int(up), component=component)
+            if up != previous.get(component):
+                logger.log(
+                    logging.INFO if up else logging.WARNING,
+                    "%s is %s",
+                    component,
+                    "up" if up else "down",
+                )
+        return health
+
+    def _on_polling_error(self, error: TelegramError) -> None:
+        self._polling_failed_at = time.monotonic()
+        logger.warning("Polling failed: %s", error)
+
+    def _on_scheduler_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and (error := task.exception()):
+            logger.error("Scheduler stopped", exc_info=error)
+
+
+async def main() -> None:
+    metrics.start_dumping(
+        "worker", settings.METRICS_DIR, settings.METRICS_DUMP_INTERVAL
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    application = utils.get_telegram()
+    handlers.register(application)
+    await Worker(application).run(stop)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())